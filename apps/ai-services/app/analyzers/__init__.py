@@ -0,0 +1,16 @@
+from .corpus import CorpusIndex, CorpusRegistry
+from .engine import LOCAL_ANALYSES, LOCAL_MODEL, corpus_registry, run_local_analyses
+from .keywords import extract_keywords, keyword_confidence
+from .sentiment import score_sentiment
+
+__all__ = [
+    "CorpusIndex",
+    "CorpusRegistry",
+    "LOCAL_ANALYSES",
+    "LOCAL_MODEL",
+    "corpus_registry",
+    "run_local_analyses",
+    "extract_keywords",
+    "keyword_confidence",
+    "score_sentiment",
+]
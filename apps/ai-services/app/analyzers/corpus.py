@@ -0,0 +1,131 @@
+"""Per-tenant corpus statistics used to weight local keyword extraction."""
+
+import asyncio
+import math
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from ..clients.supabase_client import SupabaseClient
+from .keywords import split_words
+
+CORPUS_QUERIES: dict[str, dict] = {
+    "social_posts": {
+        "select": "content",
+        "fields": ["content"],
+        "order": "created_at.desc",
+        "limit": 500,
+    },
+    "social_comments": {
+        "select": "content",
+        "fields": ["content"],
+        "order": "created_at.desc",
+        "limit": 500,
+    },
+    "content_items": {
+        "select": "title,body",
+        "fields": ["title", "body"],
+        "order": "created_at.desc",
+        "limit": 200,
+    },
+}
+
+# Rebuilds in flight at once; more stale tenants just wait for a later request.
+MAX_CONCURRENT_BUILDS = 4
+
+
+def _valid_tenant(tenant_id: str) -> bool:
+    try:
+        uuid.UUID(tenant_id)
+    except ValueError:
+        return False
+    return True
+
+
+class CorpusIndex:
+    """Document-frequency table over a tenant's own posts, comments and content."""
+
+    def __init__(self) -> None:
+        self.documents = 0
+        self.document_frequency: Counter[str] = Counter()
+        self.built_at = time.monotonic()
+
+    def add_document(self, text: str) -> None:
+        terms = set(split_words(text))
+        if not terms:
+            return
+        self.documents += 1
+        self.document_frequency.update(terms)
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency (always >= 1)."""
+        return math.log((1 + self.documents) / (1 + self.document_frequency[term])) + 1.0
+
+
+class CorpusRegistry:
+    """Caches one :class:`CorpusIndex` per tenant and rebuilds it in the background.
+
+    ``get`` never waits on Supabase: a missing or stale index schedules a
+    rebuild and the caller gets whatever is cached now (possibly ``None``).
+    ``tenant_id`` comes from the request body, so ids that are not UUIDs are
+    ignored, at most ``max_tenants`` indexes are kept (least recently used
+    first out) and at most :data:`MAX_CONCURRENT_BUILDS` rebuilds run at once.
+    """
+
+    def __init__(self, ttl_seconds: float, max_tenants: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_tenants = max_tenants
+        self._indexes: OrderedDict[str, CorpusIndex] = OrderedDict()
+        self._builds: dict[str, asyncio.Task] = {}
+
+    def get(self, tenant_id: str) -> CorpusIndex | None:
+        if not _valid_tenant(tenant_id):
+            return None
+        index = self._indexes.get(tenant_id)
+        if index is not None:
+            self._indexes.move_to_end(tenant_id)
+        stale = index is None or time.monotonic() - index.built_at > self.ttl_seconds
+        if (
+            stale
+            and tenant_id not in self._builds
+            and len(self._builds) < MAX_CONCURRENT_BUILDS
+        ):
+            task = asyncio.get_running_loop().create_task(self.build(tenant_id))
+            self._builds[tenant_id] = task
+            task.add_done_callback(lambda _: self._builds.pop(tenant_id, None))
+        return index
+
+    async def build(self, tenant_id: str) -> CorpusIndex:
+        """Fetch the tenant's text from Supabase and replace its cached index."""
+        index = CorpusIndex()
+        try:
+            sb = SupabaseClient()
+            results = await asyncio.gather(
+                *(
+                    sb.query(
+                        table,
+                        select=config["select"],
+                        filters={"tenant_id": f"eq.{tenant_id}"},
+                        order=config["order"],
+                        limit=config["limit"],
+                    )
+                    for table, config in CORPUS_QUERIES.items()
+                ),
+                return_exceptions=True,
+            )
+            for config, rows in zip(CORPUS_QUERIES.values(), results):
+                if isinstance(rows, BaseException):
+                    continue
+                for row in rows:
+                    index.add_document(
+                        " ".join(str(row[f]) for f in config["fields"] if row.get(f))
+                    )
+        except Exception:
+            # Keep the empty index until the TTL expires so a Supabase outage
+            # does not trigger a rebuild on every request.
+            pass
+        self._indexes[tenant_id] = index
+        self._indexes.move_to_end(tenant_id)
+        while len(self._indexes) > self.max_tenants:
+            self._indexes.popitem(last=False)
+        return index
@@ -0,0 +1,47 @@
+"""Local fast path for ``/api/ai/analyze/``.
+
+Only the analyses in :data:`LOCAL_ANALYSES` have a local implementation; the
+router sends everything else (and anything the local engine is not confident
+about) to the LLM.
+"""
+
+from ..config import settings
+from .corpus import CorpusRegistry
+from .keywords import extract_keywords, keyword_confidence
+from .sentiment import score_sentiment
+
+LOCAL_MODEL = "ccd-local-v1"
+LOCAL_ANALYSES: frozenset[str] = frozenset({"sentiment", "keywords"})
+
+corpus_registry = CorpusRegistry(
+    ttl_seconds=settings.corpus_index_ttl_seconds,
+    max_tenants=settings.corpus_index_max_tenants,
+)
+
+
+def run_local_analyses(
+    text: str,
+    analyses: list[str],
+    *,
+    tenant_id: str | None = None,
+    min_confidence: float | None = None,
+) -> dict:
+    """Run the locally supported subset of ``analyses`` over ``text``.
+
+    With ``min_confidence`` set, results the engine is not sure enough about
+    are left out so the caller can fall back to the LLM for them.
+    """
+    results: dict = {}
+
+    if "sentiment" in analyses:
+        sentiment = score_sentiment(text)
+        if min_confidence is None or sentiment["confidence"] >= min_confidence:
+            results["sentiment"] = sentiment
+
+    if "keywords" in analyses:
+        index = corpus_registry.get(tenant_id) if tenant_id else None
+        keywords = extract_keywords(text, index)
+        if min_confidence is None or keyword_confidence(text, keywords) >= min_confidence:
+            results["keywords"] = keywords
+
+    return results
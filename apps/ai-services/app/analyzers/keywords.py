@@ -0,0 +1,133 @@
+"""RAKE keyword extraction weighted by tenant corpus IDF.
+
+Candidate phrases are the runs of words between stopwords and punctuation
+(RAKE). Each word is scored by degree / frequency, a phrase by the sum of its
+word scores, and the phrase score is then scaled by the mean inverse document
+frequency of its words so that terms every tenant post uses ("sale", "today")
+rank below the ones that make this text distinctive.
+
+:func:`keyword_confidence` rates how much to trust the result, the way
+``score_sentiment`` does for sentiment, so the engine can send short or noisy
+texts to the LLM instead.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from .lexicon import STOPWORDS
+
+if TYPE_CHECKING:
+    from .corpus import CorpusIndex
+
+_PHRASE_SPLIT_RE = re.compile(r"[.,;:!?()\[\]{}\"“”|/\\\n\t]+|\s[-–—]\s")
+_WORD_RE = re.compile(r"#?[a-z0-9][a-z0-9'’\-]*")
+_HASHTAG_RE = re.compile(r"#([A-Za-z0-9_]+)")
+
+# Letters only, at most 20 of them, no character tripled ("loooool")
+_WORDLIKE_RE = re.compile(r"^(?!.*(.)\1\1)[a-z][a-z'’\-]{0,19}$")
+_VOWELS = frozenset("aeiouy")
+
+MAX_KEYWORDS = 10
+MAX_PHRASE_WORDS = 4
+CONTENT_WORDS_SCALE = 4.0
+SEPARATION_WEIGHT = 0.3
+
+
+def split_words(text: str) -> list[str]:
+    """Lowercase ``text`` and return its word tokens (hashtags keep their ``#``)."""
+    return [
+        w.replace("'", "").replace("’", "").strip("-")
+        for w in _WORD_RE.findall(text.lower())
+    ]
+
+
+def _candidate_phrases(text: str) -> list[tuple[str, ...]]:
+    phrases: list[tuple[str, ...]] = []
+    for fragment in _PHRASE_SPLIT_RE.split(text.lower()):
+        current: list[str] = []
+        for word in split_words(fragment):
+            if word.startswith("#"):
+                continue
+            if word in STOPWORDS or len(word) < 2 or word.isdigit():
+                if current:
+                    phrases.append(tuple(current))
+                current = []
+                continue
+            current.append(word)
+            if len(current) == MAX_PHRASE_WORDS:
+                phrases.append(tuple(current))
+                current = []
+        if current:
+            phrases.append(tuple(current))
+    return phrases
+
+
+def extract_keywords(
+    text: str,
+    index: "CorpusIndex | None" = None,
+    *,
+    limit: int = MAX_KEYWORDS,
+) -> list[dict]:
+    """Return up to ``limit`` ``{"keyword", "relevance"}`` objects for ``text``.
+
+    Without an ``index`` every word has an IDF of 1 and the ranking is plain
+    RAKE. Relevance is normalised so the top keyword scores 1.0.
+    """
+    phrases = _candidate_phrases(text)
+
+    frequency: Counter[str] = Counter()
+    degree: Counter[str] = Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+
+    scores: dict[str, float] = {}
+    for phrase, count in Counter(phrases).items():
+        rake = sum(degree[w] / frequency[w] for w in phrase)
+        idf = sum(index.idf(w) for w in phrase) / len(phrase) if index else 1.0
+        scores[" ".join(phrase)] = rake * idf * count
+
+    hashtag_base = max(scores.values(), default=1.0) * 0.8
+    for tag in {t.lower() for t in _HASHTAG_RE.findall(text)}:
+        idf = index.idf(f"#{tag}") if index else 1.0
+        scores[f"#{tag}"] = hashtag_base * idf
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    if not ranked:
+        return []
+
+    top = ranked[0][1]
+    return [
+        {"keyword": keyword, "relevance": round(score / top, 3)}
+        for keyword, score in ranked
+    ]
+
+
+def keyword_confidence(text: str, keywords: list[dict]) -> float:
+    """Return a 0-1 confidence for ``keywords`` extracted from ``text``.
+
+    Grows with the number of content words (a two-word comment has little to
+    rank), drops with the share of tokens that do not look like words (URLs,
+    handles, "asdf", "loooool"), and is slightly lower when the candidates'
+    scores are all tied, i.e. the ranking carries no signal.
+    """
+    if not keywords:
+        return 0.0
+    content = [
+        w for w in split_words(text)
+        if not w.startswith("#") and w not in STOPWORDS and len(w) >= 2 and not w.isdigit()
+    ]
+    if not content:
+        return 0.0
+
+    coverage = 1 - math.exp(-len(content) / CONTENT_WORDS_SCALE)
+    wordlike = sum(
+        bool(_WORDLIKE_RE.match(w)) and not _VOWELS.isdisjoint(w) for w in content
+    ) / len(content)
+    runners_up = [k["relevance"] for k in keywords[1:5]]
+    separation = 1 - (sum(runners_up) / len(runners_up) if runners_up else 0.0)
+    confidence = coverage * wordlike * (1 - SEPARATION_WEIGHT + SEPARATION_WEIGHT * separation)
+    return round(confidence, 3)
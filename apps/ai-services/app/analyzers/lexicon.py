@@ -0,0 +1,88 @@
+"""Word lists used by the local analyzers.
+
+Sentiment weights follow the usual valence-lexicon convention: roughly -3
+(strongly negative) to +3 (strongly positive). The list is tuned for short
+social comments and customer messages rather than long-form prose.
+"""
+
+SENTIMENT_LEXICON: dict[str, float] = {
+    # Positive
+    "amazing": 2.8, "awesome": 2.8, "beautiful": 2.4, "best": 2.6, "better": 1.6,
+    "brilliant": 2.8, "congrats": 2.2, "congratulations": 2.3, "cool": 1.4,
+    "delicious": 2.4, "delighted": 2.6, "easy": 1.2, "enjoy": 1.8, "enjoyed": 1.9,
+    "excellent": 2.8, "excited": 2.0, "exciting": 2.0, "fabulous": 2.6,
+    "fantastic": 2.8, "fast": 1.0, "favorite": 2.0, "favourite": 2.0, "fine": 0.8,
+    "fun": 1.8, "glad": 1.8, "good": 1.9, "gorgeous": 2.5, "great": 2.5,
+    "happy": 2.3, "helpful": 1.9, "impressed": 2.0, "impressive": 2.1,
+    "incredible": 2.6, "inspiring": 2.1, "liked": 1.4, "love": 3.0,
+    "loved": 2.9, "lovely": 2.5, "loving": 2.6, "nice": 1.8, "outstanding": 2.9,
+    "perfect": 2.7, "pleased": 2.0, "polite": 1.3, "professional": 1.4,
+    "quick": 1.0, "recommend": 1.9, "recommended": 1.9, "reliable": 1.6,
+    "responsive": 1.4, "satisfied": 1.8, "smooth": 1.3, "solid": 1.2,
+    "stunning": 2.6, "superb": 2.8, "thank": 1.6, "thanks": 1.6,
+    "thrilled": 2.7, "useful": 1.5, "valuable": 1.7, "win": 1.8, "wonderful": 2.8,
+    "worth": 1.4, "wow": 2.2, "yay": 2.2,
+    # Negative
+    "angry": -2.6, "annoyed": -2.0, "annoying": -2.1, "awful": -2.8, "bad": -2.3,
+    "boring": -1.8, "broke": -1.8, "broken": -2.0, "bug": -1.3, "buggy": -2.0,
+    "cancel": -1.4, "cheap": -0.8, "complain": -1.8, "complaint": -1.9,
+    "confusing": -1.6, "crap": -2.6, "delay": -1.4, "delayed": -1.5,
+    "difficult": -1.3, "disappointed": -2.3, "disappointing": -2.3,
+    "disgusting": -2.9, "dislike": -1.9, "expensive": -1.2, "fail": -2.1,
+    "failed": -2.1, "fails": -2.0, "failure": -2.3, "fake": -2.1, "frustrated": -2.2,
+    "frustrating": -2.2, "hate": -3.0, "hated": -2.9, "horrible": -2.9,
+    "issue": -1.1, "issues": -1.2, "lame": -1.7, "late": -1.2, "mediocre": -1.4,
+    "mess": -1.7, "missing": -1.2, "nightmare": -2.7, "overpriced": -1.9,
+    "pathetic": -2.6, "poor": -2.1, "problem": -1.4, "problems": -1.5,
+    "refund": -1.3, "rude": -2.3, "sad": -2.0, "scam": -3.0, "slow": -1.5,
+    "spam": -2.0, "stupid": -2.4, "terrible": -2.9, "ugly": -2.2, "unacceptable": -2.5,
+    "unhappy": -2.2, "unhelpful": -2.0, "useless": -2.5, "waste": -2.3,
+    "wasted": -2.3, "worse": -2.2, "worst": -3.0, "wrong": -1.7,
+}
+
+EMOJI_LEXICON: dict[str, float] = {
+    "\U0001F600": 2.0, "\U0001F603": 2.0, "\U0001F604": 2.2, "\U0001F60A": 2.0,
+    "\U0001F60D": 2.8, "\U0001F970": 2.8, "\U0001F929": 2.6, "\U0001F44D": 1.8,
+    "\U0001F44F": 1.8, "\U0001F525": 1.8, "\U0001F389": 2.0, "\U0001F4AF": 2.0,
+    "❤": 2.6, "✨": 1.2, "\U0001F64C": 2.0, "\U0001F642": 1.0,
+    "\U0001F620": -2.6, "\U0001F621": -2.8, "\U0001F622": -2.0, "\U0001F62D": -2.2,
+    "\U0001F61E": -2.0, "\U0001F612": -1.6, "\U0001F44E": -2.0, "\U0001F92C": -3.0,
+    "\U0001F644": -1.6, "\U0001F615": -1.2,
+}
+
+NEGATORS: frozenset[str] = frozenset({
+    "not", "no", "never", "nothing", "nobody", "none", "neither", "nor", "without",
+    "hardly", "barely", "cannot", "cant", "dont", "doesnt", "didnt", "isnt", "wasnt",
+    "arent", "werent", "wont", "wouldnt", "shouldnt", "couldnt", "aint",
+})
+
+INTENSIFIERS: dict[str, float] = {
+    "absolutely": 0.35, "completely": 0.3, "extremely": 0.4, "highly": 0.3,
+    "incredibly": 0.4, "really": 0.3, "so": 0.25, "super": 0.3, "totally": 0.3,
+    "truly": 0.3, "very": 0.3, "most": 0.25,
+    "barely": -0.4, "kinda": -0.3, "slightly": -0.4, "somewhat": -0.3,
+    "little": -0.3, "bit": -0.2,
+}
+
+CONTRAST_WORDS: frozenset[str] = frozenset({"but", "however", "although", "though", "yet"})
+
+STOPWORDS: frozenset[str] = frozenset({
+    "a", "about", "above", "after", "again", "against", "all", "also", "am", "an",
+    "and", "any", "are", "as", "at", "be", "because", "been", "before", "being",
+    "below", "between", "both", "but", "by", "can", "could", "did", "do", "does",
+    "doing", "down", "during", "each", "even", "ever", "every", "few", "for", "from",
+    "further", "get", "got", "had", "has", "have", "having", "he", "her", "here",
+    "hers", "herself", "him", "himself", "his", "how", "i", "if", "im", "in", "into",
+    "is", "it", "its", "itself", "just", "let", "lets", "me", "more", "most", "much",
+    "must", "my", "myself", "new", "no", "nor", "not", "now", "of", "off", "on",
+    "once", "one", "only", "or", "other", "our", "ours", "ourselves", "out", "over",
+    "own", "really", "same", "she", "should", "so", "some", "such", "than", "that",
+    "thats", "the", "their", "theirs", "them", "themselves", "then", "there",
+    "these", "they", "this", "those", "through", "to", "too", "under", "until", "up",
+    "us", "very", "via", "was", "we", "well", "were", "what", "when", "where",
+    "which", "while", "who", "whom", "why", "will", "with", "would", "you", "your",
+    "yours", "yourself", "yourselves", "youre", "ive", "weve", "theyre", "dont",
+    "didnt", "doesnt", "isnt", "wasnt", "cant", "wont", "may", "might", "shall",
+    "many", "make", "made", "like", "want", "need", "go", "going", "see", "know",
+    "think", "thing", "things", "way", "yes", "yeah", "ok", "okay", "lol",
+})
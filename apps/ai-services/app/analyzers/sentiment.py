@@ -0,0 +1,115 @@
+"""Lexicon-based linear sentiment scorer.
+
+Each lexicon hit contributes its valence, adjusted for nearby negators and
+intensifiers; clauses after a contrast word ("but", "however") carry more
+weight than those before it. The summed valence is squashed into [-1, 1] and
+returned in the same shape the LLM path produces for ``"sentiment"``.
+"""
+
+import math
+import re
+
+from .lexicon import CONTRAST_WORDS, EMOJI_LEXICON, INTENSIFIERS, NEGATORS, SENTIMENT_LEXICON
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9]*")
+
+NEGATION_WINDOW = 3
+NEGATION_FACTOR = -0.74
+CONTRAST_BEFORE = 0.5
+CONTRAST_AFTER = 1.5
+CAPS_BOOST = 0.2
+EXCLAMATION_BOOST = 0.1
+NORMALIZATION_ALPHA = 15.0
+MIXED_RATIO = 0.6
+NEUTRAL_BAND = 0.05
+# Confidence coverage per lexicon hit; low enough that a single hit stays
+# below the default 0.6 threshold (1 - e^-0.9 = 0.59 before the score term)
+COVERAGE_RATE = 0.9
+
+
+def _tokenize(text: str) -> list[str]:
+    return _WORD_RE.findall(text.replace("'", "").replace("’", ""))
+
+
+def _conflict(valences: list[tuple[int, float]]) -> float:
+    positive = sum(v for _, v in valences if v > 0)
+    negative = -sum(v for _, v in valences if v < 0)
+    if min(positive, negative) < 1.0:
+        return 0.0
+    return min(positive, negative) / max(positive, negative)
+
+
+def score_sentiment(text: str) -> dict:
+    """Score ``text`` and return ``{"label", "score", "confidence"}``.
+
+    Confidence grows with the number of lexicon hits and the magnitude of the
+    score, and drops when positive and negative evidence cancel out. Callers
+    use it to decide whether the local result is good enough or the request
+    should go to the LLM.
+    """
+    raw_tokens = _tokenize(text)
+    tokens = [t.lower() for t in raw_tokens]
+    shouting = bool(raw_tokens) and all(t.isupper() for t in raw_tokens)
+
+    valences: list[tuple[int, float]] = []
+    last_contrast = -1
+    for i, token in enumerate(tokens):
+        if token in CONTRAST_WORDS:
+            last_contrast = i
+            continue
+        valence = SENTIMENT_LEXICON.get(token)
+        if valence is None:
+            continue
+        if i > 0 and tokens[i - 1] in INTENSIFIERS:
+            valence *= 1 + INTENSIFIERS[tokens[i - 1]]
+        if any(t in NEGATORS for t in tokens[max(0, i - NEGATION_WINDOW):i]):
+            valence *= NEGATION_FACTOR
+        if not shouting and len(raw_tokens[i]) > 1 and raw_tokens[i].isupper():
+            valence *= 1 + CAPS_BOOST
+        valences.append((i, valence))
+
+    for char in text:
+        if char in EMOJI_LEXICON:
+            valences.append((len(tokens), EMOJI_LEXICON[char]))
+
+    if not valences:
+        return {"label": "neutral", "score": 0.0, "confidence": 0.3 if tokens else 0.0}
+
+    # Mixed sentiment is judged on the unweighted evidence: "great product but
+    # awful shipping" is mixed even though the contrast makes it lean negative.
+    conflict = _conflict(valences)
+
+    if last_contrast >= 0:
+        valences = [
+            (i, v * (CONTRAST_BEFORE if i < last_contrast else CONTRAST_AFTER))
+            for i, v in valences
+        ]
+
+    positive = sum(v for _, v in valences if v > 0)
+    negative = -sum(v for _, v in valences if v < 0)
+    total = positive - negative
+    if total:
+        total *= 1 + EXCLAMATION_BOOST * min(text.count("!"), 3)
+
+    score = total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+
+    if conflict >= MIXED_RATIO:
+        label = "mixed"
+    elif score >= NEUTRAL_BAND:
+        label = "positive"
+    elif score <= -NEUTRAL_BAND:
+        label = "negative"
+    else:
+        label = "neutral"
+
+    coverage = 1 - math.exp(-COVERAGE_RATE * len(valences))
+    if label == "mixed":
+        confidence = coverage * (0.4 + 0.4 * conflict)
+    else:
+        confidence = coverage * (0.6 + 0.4 * abs(score)) * (1 - 0.5 * conflict)
+
+    return {
+        "label": label,
+        "score": round(score, 3),
+        "confidence": round(confidence, 3),
+    }
@@ -0,0 +1,36 @@
+import logging
+
+from ..config import settings
+from .embedding import embed_text, guard_terms, normalize_text
+from .semantic import CacheEntry, SemanticCache, request_namespace
+
+logger = logging.getLogger(__name__)
+
+# Entries, invalidation and counters are per process; with several workers an
+# invalidate call would leave the other workers serving the stale answer.
+_disabled_reason = None
+if settings.semantic_cache_routes and settings.workers > 1:
+    _disabled_reason = (
+        f"the cache is per process and the service runs {settings.workers} workers"
+    )
+    logger.warning("Semantic cache disabled: %s", _disabled_reason)
+
+semantic_cache = SemanticCache(
+    routes=settings.semantic_cache_routes,
+    threshold=settings.semantic_cache_threshold,
+    ttl_seconds=settings.semantic_cache_ttl_seconds,
+    max_entries=settings.semantic_cache_max_entries,
+    max_tenants=settings.semantic_cache_max_tenants,
+    dimensions=settings.semantic_cache_dimensions,
+    disabled_reason=_disabled_reason,
+)
+
+__all__ = [
+    "CacheEntry",
+    "SemanticCache",
+    "embed_text",
+    "guard_terms",
+    "normalize_text",
+    "request_namespace",
+    "semantic_cache",
+]
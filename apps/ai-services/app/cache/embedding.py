@@ -0,0 +1,103 @@
+"""Local hashed bag-of-n-grams embeddings for the semantic cache.
+
+Re-asked prompts ("Can you write a caption for our Black Friday sale?" vs
+"write a caption for our Black Friday sale please") share most of their word
+and character n-grams, so a signed feature-hashing vector is enough to find
+them and costs microseconds instead of an embeddings API round trip.
+
+The vector says nothing about meaning, though: prompts that differ only in a
+number, a name or a negation ("invoice 1043" / "invoice 1044", "20% off" /
+"50% off", "Do not mention pricing") score as near-identical. Those are
+exactly the details that change the answer, so :func:`guard_terms` extracts
+them and the cache only compares prompts whose guard terms match exactly.
+Real paraphrases (reworded, reordered) mostly score below the threshold and
+miss; this cache is for repeats, not synonyms.
+"""
+
+import hashlib
+import re
+
+import numpy as np
+
+_NORMALIZE_RE = re.compile(r"[^a-z0-9#@ ]+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Politeness and request framing that never changes the answer
+_FILLER_WORDS = frozenset({"please", "pls", "kindly", "can", "could", "would", "you"})
+
+_NUMBER_RE = re.compile(r"[$€£¥]?\d+(?:[.,:/-]\d+)*%?")
+_NEGATOR_RE = re.compile(
+    r"\b(?:not|no|never|none|nothing|nobody|neither|nor|without|except|avoid|cannot)\b|n't\b"
+)
+_NUMBER_WORDS = frozenset(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen "
+    "fourteen fifteen sixteen seventeen eighteen nineteen twenty thirty forty fifty "
+    "sixty seventy eighty ninety hundred thousand million billion half double twice "
+    "first second third fourth fifth sixth seventh eighth ninth tenth".split()
+)
+_WORD_RE = re.compile(r"[\w'’]+|[.!?\n]")
+_QUOTED_RE = re.compile(r"[\"“”]([^\"“”]{1,80})[\"“”]")
+_HANDLE_RE = re.compile(r"[@#]\w+|\S+@\S+\.\w+|https?://\S+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return _SPACE_RE.sub(" ", _NORMALIZE_RE.sub(" ", text.lower())).strip()
+
+
+def guard_terms(text: str) -> tuple[str, ...]:
+    """Details of ``text`` that must match exactly for a cache hit.
+
+    Numbers (with currency / percent signs), number words, negations,
+    quoted strings, handles / hashtags / URLs and capitalised words that do
+    not start a sentence (names, products, places, acronyms).
+    """
+    lowered = text.lower().replace("’", "'")
+    negations = len(_NEGATOR_RE.findall(lowered))
+    terms = [f"n:{m}" for m in _NUMBER_RE.findall(lowered)]
+    terms.append(f"not:{negations}")
+    terms += sorted(f"q:{normalize_text(m)}" for m in _QUOTED_RE.findall(text))
+    terms += sorted(f"h:{m.lower()}" for m in _HANDLE_RE.findall(text))
+
+    entities = set()
+    sentence_start = True
+    for token in _WORD_RE.findall(text):
+        if token in ".!?\n":
+            sentence_start = True
+            continue
+        if token.lower() in _NUMBER_WORDS:
+            terms.append(f"w:{token.lower()}")
+        if token[0].isupper() and (not sentence_start or any(c.isupper() for c in token[1:])):
+            entities.add(token.lower())
+        sentence_start = False
+    terms += sorted(f"e:{e}" for e in entities)
+    return tuple(terms)
+
+
+def _features(text: str) -> list[str]:
+    words = [w for w in text.split() if w not in _FILLER_WORDS]
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return features
+
+
+def embed_text(text: str, dimensions: int) -> np.ndarray:
+    """Return an L2-normalised float32 vector of size ``dimensions`` for ``text``."""
+    features = _features(normalize_text(text))
+    vector = np.zeros(dimensions, dtype=np.float32)
+    if not features:
+        return vector
+
+    digests = [hashlib.blake2b(f.encode(), digest_size=8).digest() for f in features]
+    buckets = np.fromiter(
+        (int.from_bytes(d[:4], "little") % dimensions for d in digests), dtype=np.int64
+    )
+    signs = np.fromiter((1.0 if d[4] & 1 else -1.0 for d in digests), dtype=np.float32)
+    np.add.at(vector, buckets, signs)
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
@@ -0,0 +1,309 @@
+"""Per-tenant semantic response cache.
+
+Each tenant gets a fixed-capacity NumPy matrix of prompt embeddings. A lookup
+is one matrix-vector product masked to live entries of the same namespace
+(route + prompt type/module + anything else that changes the answer, e.g.
+entity context) and to prompts with the same guard terms (numbers, names,
+negations -- see :func:`~.embedding.guard_terms`); the best match above
+``threshold`` is returned. Entries expire after ``ttl_seconds`` and the least
+recently used slot is reused when a tenant's index is full.
+
+``tenant_id`` comes from the request body, so only UUIDs are accepted and at
+most ``max_tenants`` indexes are kept; the least recently used tenant's whole
+index is dropped to make room for a new one.
+
+The index lives in process memory, so every worker process would hold its
+own copy: invalidation and stats would only reach the worker that handled
+the call. The cache is therefore switched off when the service runs more
+than one worker (see ``app.cache``).
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ..metrics import CACHE_LOOKUPS
+from .embedding import embed_text, guard_terms
+
+# Tenant indexes start small and double up to ``max_entries`` so idle tenants
+# do not each hold a full-size embedding matrix.
+INITIAL_CAPACITY = 64
+
+
+def _valid_tenant(tenant_id: str | None) -> bool:
+    if not tenant_id:
+        return False
+    try:
+        uuid.UUID(tenant_id)
+    except ValueError:
+        return False
+    return True
+
+
+def request_namespace(*parts: object) -> str:
+    """Stable short hash of the request fields that must match exactly."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _scoped(namespace: str, text: str) -> str:
+    # Prompts only compete on similarity once their guard terms agree.
+    return request_namespace(namespace, guard_terms(text))
+
+
+@dataclass
+class CacheEntry:
+    id: str
+    tenant_id: str
+    route: str
+    namespace: str
+    value: dict
+    created_at: float
+    expires_at: float
+    hits: int = 0
+    similarity: float = 1.0
+
+
+@dataclass
+class _TenantIndex:
+    capacity: int
+    dimensions: int
+    vectors: np.ndarray = field(init=False)
+    expires_at: np.ndarray = field(init=False)
+    namespace_ids: np.ndarray = field(init=False)
+    entries: list[CacheEntry | None] = field(init=False)
+    namespaces: dict[str, int] = field(default_factory=dict)
+    lru: OrderedDict[int, None] = field(default_factory=OrderedDict)
+
+    def __post_init__(self) -> None:
+        self.vectors = np.zeros((self.capacity, self.dimensions), dtype=np.float32)
+        self.expires_at = np.zeros(self.capacity, dtype=np.float64)
+        self.namespace_ids = np.full(self.capacity, -1, dtype=np.int32)
+        self.entries = [None] * self.capacity
+
+    def namespace_id(self, key: str) -> int:
+        if key not in self.namespaces and len(self.namespaces) >= 4 * self.capacity:
+            self._compact_namespaces()
+        return self.namespaces.setdefault(key, len(self.namespaces))
+
+    def _compact_namespaces(self) -> None:
+        # Namespaces include hashes of per-request context, so drop the ids
+        # no live entry refers to before the mapping grows without bound.
+        self.namespaces = {}
+        for slot, entry in enumerate(self.entries):
+            if entry is not None:
+                key = f"{entry.route}:{entry.namespace}"
+                self.namespace_ids[slot] = self.namespaces.setdefault(key, len(self.namespaces))
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        self.vectors = np.vstack(
+            [self.vectors, np.zeros((extra, self.dimensions), dtype=np.float32)]
+        )
+        self.expires_at = np.concatenate([self.expires_at, np.zeros(extra)])
+        self.namespace_ids = np.concatenate(
+            [self.namespace_ids, np.full(extra, -1, dtype=np.int32)]
+        )
+        self.entries += [None] * extra
+        self.capacity = capacity
+
+    def clear(self, slot: int) -> CacheEntry | None:
+        entry = self.entries[slot]
+        self.entries[slot] = None
+        self.expires_at[slot] = 0.0
+        self.namespace_ids[slot] = -1
+        self.lru.pop(slot, None)
+        return entry
+
+
+class SemanticCache:
+    """Nearest-neighbour cache of model responses keyed by prompt similarity."""
+
+    def __init__(
+        self,
+        *,
+        routes: list[str],
+        threshold: float,
+        ttl_seconds: float,
+        max_entries: int,
+        max_tenants: int,
+        dimensions: int,
+        disabled_reason: str | None = None,
+    ) -> None:
+        self.routes = set() if disabled_reason else set(routes)
+        self.disabled_reason = disabled_reason
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_tenants = max_tenants
+        self.dimensions = dimensions
+        self._tenants: OrderedDict[str, _TenantIndex] = OrderedDict()
+        self._by_id: dict[str, tuple[str, int]] = {}
+        self._counters: Counter[tuple[str, str]] = Counter()
+
+    def enabled_for(self, route: str) -> bool:
+        return route in self.routes
+
+    def accepts_tenant(self, tenant_id: str | None) -> bool:
+        """Whether ``tenant_id`` can have cache entries (a UUID)."""
+        return _valid_tenant(tenant_id)
+
+    def _count(self, route: str, result: str) -> None:
+        self._counters[(route, result)] += 1
+        CACHE_LOOKUPS.labels("semantic", route, result).inc()
+
+    def lookup(self, route: str, tenant_id: str, namespace: str, text: str) -> CacheEntry | None:
+        """Return the closest live entry above the similarity threshold, if any."""
+        index = self._tenants.get(tenant_id) if _valid_tenant(tenant_id) else None
+        if index is None:
+            self._count(route, "miss")
+            return None
+
+        key = f"{route}:{_scoped(namespace, text)}"
+        ns_id = index.namespaces.get(key)
+        if ns_id is None:
+            self._count(route, "miss")
+            return None
+
+        now = time.time()
+        live = (index.namespace_ids == ns_id) & (index.expires_at > now)
+        if not live.any():
+            self._count(route, "miss")
+            return None
+
+        similarities = index.vectors @ embed_text(text, self.dimensions)
+        similarities[~live] = -1.0
+        slot = int(np.argmax(similarities))
+        similarity = float(similarities[slot])
+        if similarity < self.threshold:
+            self._count(route, "miss")
+            return None
+
+        entry = index.entries[slot]
+        entry.hits += 1
+        entry.similarity = similarity
+        index.lru.move_to_end(slot)
+        self._tenants.move_to_end(tenant_id)
+        self._count(route, "hit")
+        return entry
+
+    def store(
+        self, route: str, tenant_id: str, namespace: str, text: str, value: dict
+    ) -> CacheEntry:
+        """Cache ``value`` as the answer for ``text`` and return the new entry.
+
+        Raises ``ValueError`` for a ``tenant_id`` :meth:`accepts_tenant` rejects.
+        """
+        if not _valid_tenant(tenant_id):
+            raise ValueError(f"Invalid tenant id for the semantic cache: {tenant_id!r}")
+        index = self._tenants.get(tenant_id)
+        if index is None:
+            while len(self._tenants) >= self.max_tenants:
+                self._evict_tenant(route)
+            index = _TenantIndex(
+                capacity=min(INITIAL_CAPACITY, self.max_entries), dimensions=self.dimensions
+            )
+            self._tenants[tenant_id] = index
+        self._tenants.move_to_end(tenant_id)
+
+        namespace = _scoped(namespace, text)
+        slot = self._free_slot(index, route)
+        now = time.time()
+        entry = CacheEntry(
+            id=uuid.uuid4().hex,
+            tenant_id=tenant_id,
+            route=route,
+            namespace=namespace,
+            value=value,
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        index.vectors[slot] = embed_text(text, self.dimensions)
+        index.expires_at[slot] = entry.expires_at
+        index.namespace_ids[slot] = index.namespace_id(f"{route}:{namespace}")
+        index.entries[slot] = entry
+        index.lru[slot] = None
+        self._by_id[entry.id] = (tenant_id, slot)
+        self._counters[(route, "store")] += 1
+        return entry
+
+    def _evict_tenant(self, route: str) -> None:
+        _, index = self._tenants.popitem(last=False)
+        for entry in index.entries:
+            if entry is not None:
+                self._by_id.pop(entry.id, None)
+        self._counters[(route, "evict_tenant")] += 1
+
+    def _free_slot(self, index: _TenantIndex, route: str) -> int:
+        empty = np.flatnonzero(index.namespace_ids == -1)
+        if empty.size:
+            return int(empty[0])
+        if index.capacity < self.max_entries:
+            slot = index.capacity
+            index.grow(min(index.capacity * 2, self.max_entries))
+            return slot
+
+        expired = np.flatnonzero(index.expires_at <= time.time())
+        if expired.size:
+            slot = int(expired[0])
+            self._counters[(route, "expire")] += 1
+        else:
+            slot = next(iter(index.lru))
+            self._counters[(route, "evict")] += 1
+        old = index.clear(slot)
+        if old is not None:
+            self._by_id.pop(old.id, None)
+        return slot
+
+    def invalidate(
+        self,
+        *,
+        entry_ids: list[str] | None = None,
+        tenant_id: str | None = None,
+        route: str | None = None,
+    ) -> int:
+        """Drop matching entries and return how many were removed.
+
+        ``entry_ids`` targets specific answers; otherwise every entry matching
+        the given ``tenant_id`` and/or ``route`` is removed.
+        """
+        slots: list[tuple[str, int]] = []
+        if entry_ids:
+            slots = [self._by_id[i] for i in entry_ids if i in self._by_id]
+        else:
+            for tid, index in self._tenants.items():
+                if tenant_id is not None and tid != tenant_id:
+                    continue
+                slots += [
+                    (tid, slot)
+                    for slot, entry in enumerate(index.entries)
+                    if entry is not None and (route is None or entry.route == route)
+                ]
+
+        removed = 0
+        for tid, slot in slots:
+            entry = self._tenants[tid].clear(slot)
+            if entry is not None:
+                self._by_id.pop(entry.id, None)
+                self._counters[(entry.route, "invalidate")] += 1
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Per-route lookup counters and hit rate plus current entry count."""
+        routes: dict[str, dict] = {}
+        for (route, event), count in self._counters.items():
+            routes.setdefault(route, {})[event] = count
+        for counts in routes.values():
+            lookups = counts.get("hit", 0) + counts.get("miss", 0)
+            counts["hit_rate"] = round(counts.get("hit", 0) / lookups, 4) if lookups else 0.0
+        return {
+            "entries": len(self._by_id),
+            "tenants": len(self._tenants),
+            "routes": routes,
+        }
@@ -1,4 +1,5 @@
-from .anthropic_client import get_anthropic_client
+from .anthropic_client import get_anthropic_client, get_sync_anthropic_client
+from .openai_client import get_openai_client
 from .supabase_client import SupabaseClient
 
-__all__ = ["get_anthropic_client", "SupabaseClient"]
+__all__ = ["get_anthropic_client", "get_sync_anthropic_client", "get_openai_client", "SupabaseClient"]
@@ -1,9 +1,46 @@
-import anthropic
+"""Shared Anthropic clients.
+
+The SDK is the slowest import in the service, so it is only imported when a
+client is first requested (or during worker warm-up, see ``app.warmup``).
+Clients are created once per process and reuse their connection pool.
+"""
+
+from typing import TYPE_CHECKING
+
 from ..config import settings
 
+if TYPE_CHECKING:
+    import anthropic
 
-def get_anthropic_client() -> anthropic.AsyncAnthropic:
-    """Return an async Anthropic client using the configured API key."""
+_async_client: "anthropic.AsyncAnthropic | None" = None
+_sync_client: "anthropic.Anthropic | None" = None
+
+
+def get_anthropic_client() -> "anthropic.AsyncAnthropic":
+    """Return the async Anthropic client using the configured API key."""
+    global _async_client
     if not settings.anthropic_api_key:
         raise RuntimeError("ANTHROPIC_API_KEY (AI_ANTHROPIC_API_KEY) is not configured")
-    return anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    if _async_client is None:
+        import anthropic
+
+        _async_client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url or None,
+        )
+    return _async_client
+
+
+def get_sync_anthropic_client() -> "anthropic.Anthropic":
+    """Return the blocking Anthropic client (used by the automation runner)."""
+    global _sync_client
+    if not settings.anthropic_api_key:
+        raise RuntimeError("ANTHROPIC_API_KEY (AI_ANTHROPIC_API_KEY) is not configured")
+    if _sync_client is None:
+        import anthropic
+
+        _sync_client = anthropic.Anthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url or None,
+        )
+    return _sync_client
@@ -0,0 +1,24 @@
+"""Shared OpenAI client, imported and created on first use."""
+
+from typing import TYPE_CHECKING
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    import openai
+
+_client: "openai.OpenAI | None" = None
+
+
+def get_openai_client() -> "openai.OpenAI":
+    """Return the OpenAI client using the configured API key."""
+    global _client
+    if not settings.openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY (AI_OPENAI_API_KEY) is not configured")
+    if _client is None:
+        import openai
+
+        _client = openai.OpenAI(
+            api_key=settings.openai_api_key, base_url=settings.openai_base_url or None
+        )
+    return _client
@@ -1,13 +1,19 @@
 """Thin httpx wrapper for Supabase REST API with tenant isolation."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import httpx
 from ..config import settings
+from ..metrics import observe_upstream
 
 
 class SupabaseClient:
     """Lightweight async Supabase REST client for server-to-server calls."""
 
-    def __init__(self) -> None:
+    def __init__(self, http: httpx.AsyncClient | None = None) -> None:
+        """Pass ``http`` to reuse one pooled client across calls; by default
+        every call opens and closes its own."""
         if not settings.supabase_url or not settings.supabase_service_role_key:
             raise RuntimeError("Supabase URL or service role key not configured")
         self.base_url = f"{settings.supabase_url}/rest/v1"
@@ -17,6 +23,15 @@ class SupabaseClient:
             "Content-Type": "application/json",
             "Prefer": "return=representation",
         }
+        self._http = http
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        if self._http is not None:
+            yield self._http
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
 
     async def query(
         self,
@@ -37,39 +52,53 @@ class SupabaseClient:
         if limit:
             params["limit"] = str(limit)
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/{table}",
-                headers=self.headers,
-                params=params,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        with observe_upstream("supabase", "query"):
+            async with self._session() as client:
+                resp = await client.get(
+                    f"{self.base_url}/{table}",
+                    headers=self.headers,
+                    params=params,
+                )
+                resp.raise_for_status()
+                return resp.json()
 
     async def insert(self, table: str, data: dict) -> dict:
         """Insert a row into a Supabase table."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.base_url}/{table}",
-                headers=self.headers,
-                json=data,
-            )
-            resp.raise_for_status()
-            rows = resp.json()
-            return rows[0] if isinstance(rows, list) and rows else rows
+        with observe_upstream("supabase", "insert"):
+            async with self._session() as client:
+                resp = await client.post(
+                    f"{self.base_url}/{table}",
+                    headers=self.headers,
+                    json=data,
+                )
+                resp.raise_for_status()
+                rows = resp.json()
+                return rows[0] if isinstance(rows, list) and rows else rows
+
+    async def insert_many(self, table: str, rows: list[dict]) -> None:
+        """Bulk-insert rows in a single request without returning them."""
+        with observe_upstream("supabase", "insert_many"):
+            async with self._session() as client:
+                resp = await client.post(
+                    f"{self.base_url}/{table}",
+                    headers={**self.headers, "Prefer": "return=minimal"},
+                    json=rows,
+                )
+                resp.raise_for_status()
 
     async def update(
         self, table: str, filters: dict[str, str], data: dict
     ) -> dict | None:
         """Update rows matching filters."""
         params = dict(filters)
-        async with httpx.AsyncClient() as client:
-            resp = await client.patch(
-                f"{self.base_url}/{table}",
-                headers=self.headers,
-                params=params,
-                json=data,
-            )
-            resp.raise_for_status()
-            rows = resp.json()
-            return rows[0] if isinstance(rows, list) and rows else rows
+        with observe_upstream("supabase", "update"):
+            async with self._session() as client:
+                resp = await client.patch(
+                    f"{self.base_url}/{table}",
+                    headers=self.headers,
+                    params=params,
+                    json=data,
+                )
+                resp.raise_for_status()
+                rows = resp.json()
+                return rows[0] if isinstance(rows, list) and rows else rows
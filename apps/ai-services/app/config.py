@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     debug: bool = False
     host: str = "0.0.0.0"
     port: int = 5100
+    # Worker processes forked by ``python -m app.serve``
+    workers: int = 1
 
     # Supabase
     supabase_url: str = ""
@@ -16,11 +18,64 @@ class Settings(BaseSettings):
     # AI Providers
     openai_api_key: str = ""
     anthropic_api_key: str = ""
+    # Override provider endpoints (e.g. the benchmark stand-ins in benchmarks/fakes.py)
+    openai_base_url: str = ""
+    anthropic_base_url: str = ""
 
     # Model defaults
     default_model: str = "claude-sonnet-4-20250514"
     max_tokens: int = 4096
 
+    # Local analysis fast path (sentiment / keywords)
+    local_analysis_enabled: bool = True
+    local_analysis_min_confidence: float = 0.6
+    local_analysis_max_chars: int = 1000
+    # engine="local" skips the cap above; this bounds the in-loop CPU time instead
+    local_analysis_hard_max_chars: int = 20000
+    corpus_index_ttl_seconds: int = 3600
+    corpus_index_max_tenants: int = 500
+
+    # Semantic response cache (opt-in per route: "generate", "chat"); per
+    # process, so it stays off unless the service runs a single worker
+    semantic_cache_routes: list[str] = []
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_ttl_seconds: int = 3600
+    semantic_cache_max_entries: int = 1000
+    # Tenant indexes kept at once (each up to max_entries x dimensions float32)
+    semantic_cache_max_tenants: int = 100
+    semantic_cache_dimensions: int = 512
+
+    # Usage accounting (write-behind to Supabase)
+    usage_recording_enabled: bool = True
+    usage_table: str = "ai_usage_events"
+    usage_batch_size: int = 200
+    usage_flush_interval_seconds: float = 5.0
+    usage_max_buffer: int = 10000
+
+    # SSE chat streaming: text deltas are coalesced into one frame per
+    # interval / size; pings keep proxies from buffering or timing out idle streams
+    stream_flush_interval_ms: float = 50.0
+    stream_flush_max_chars: int = 512
+    stream_ping_seconds: float = 15.0
+
+    # Bulk insights: model calls running at once per request
+    insights_max_concurrency: int = 4
+
+    # How often the event-loop lag monitor wakes up (0 disables it)
+    event_loop_monitor_interval_seconds: float = 0.25
+
+    # Diagnostics (profiling / tracing); the token enables the per-request headers
+    diagnostics_token: str = ""
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.0
+    tracing_export_path: str = "traces.otlp.jsonl"
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = "/tmp/ccd-ai-profiles"
+    # Retention, applied whenever a profile is written
+    profiling_max_files: int = 200
+    profiling_max_age_seconds: float = 86400.0
+    profiling_interval: float = 0.001
+
     model_config = {"env_prefix": "AI_"}
 
 
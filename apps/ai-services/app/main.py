@@ -1,13 +1,42 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse
 from datetime import datetime, timezone
 
 from .config import settings
-from .routers import chat_router, generate_router, analyze_router, insights_router, embed_router, automation_router
+from .metrics import MetricsMiddleware, mark_worker_dead, monitor_event_loop_lag, render
+from .profiling import ProfilingMiddleware, profile_path, profiling_available
+from .tracing import OTLPJsonFileExporter, TracingMiddleware, diagnostics_authorized
+from .usage import usage_recorder
+from .warmup import warm_up
+from .routers import chat_router, generate_router, analyze_router, insights_router, embed_router, automation_router, cache_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await usage_recorder.start()
+    warmup_task = asyncio.create_task(warm_up.run())
+    lag_monitor = None
+    if settings.event_loop_monitor_interval_seconds > 0:
+        lag_monitor = asyncio.create_task(
+            monitor_event_loop_lag(settings.event_loop_monitor_interval_seconds)
+        )
+    yield
+    warmup_task.cancel()
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+    # Flush buffered usage records before the worker exits
+    await usage_recorder.stop()
+    mark_worker_dead()
+
 
 app = FastAPI(
     title=settings.app_name,
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -22,6 +51,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+
+# Diagnostics are opt-in: without a token or sampling rate neither middleware
+# is installed, so requests pay nothing for them.
+if (settings.diagnostics_token or settings.profiling_sample_rate) and profiling_available():
+    app.add_middleware(ProfilingMiddleware)
+if settings.tracing_enabled:
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=OTLPJsonFileExporter(settings.tracing_export_path, "ccd-ai-services"),
+    )
 
 # Register routers
 app.include_router(chat_router)
@@ -30,6 +70,7 @@ app.include_router(analyze_router)
 app.include_router(insights_router)
 app.include_router(embed_router)
 app.include_router(automation_router)
+app.include_router(cache_router)
 
 
 @app.get("/health")
@@ -41,6 +82,30 @@ async def health():
     }
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness: 503 until this worker has imported its SDKs and built its clients."""
+    body = {"service": "ai-services", **warm_up.status()}
+    return JSONResponse(body, status_code=200 if warm_up.ready else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/api/ai/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_ccd_profile: str | None = Header(default=None)):
+    """Download a stored speedscope profile (requires the diagnostics token)."""
+    if not diagnostics_authorized(x_ccd_profile):
+        raise HTTPException(status_code=403, detail="Diagnostics token required")
+    path = profile_path(profile_id)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=path.name)
+
+
 @app.get("/api/ai/status")
 async def ai_status():
     return {
@@ -50,4 +115,5 @@ async def ai_status():
             "anthropic": bool(settings.anthropic_api_key),
         },
         "default_model": settings.default_model,
+        "usage_recording": usage_recorder.stats(),
     }
@@ -0,0 +1,227 @@
+"""Prometheus instrumentation for the AI service.
+
+Request latency and in-flight counts come from :class:`MetricsMiddleware`;
+routers and clients report upstream calls through :func:`observe_upstream`
+and streaming/cache/queue events through the metric objects below.
+
+When several uvicorn workers serve the app, set ``PROMETHEUS_MULTIPROC_DIR``
+to an empty shared directory before the workers start: every worker then
+writes its samples there and ``/metrics`` (served by any worker) reports the
+aggregate across all of them.
+"""
+
+import asyncio
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .tracing import span
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_LATENCY = Histogram(
+    "ccd_ai_request_duration_seconds",
+    "End-to-end request latency (including the full body of streamed responses).",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "ccd_ai_requests_in_flight",
+    "Requests currently being handled.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_LATENCY = Histogram(
+    "ccd_ai_upstream_duration_seconds",
+    "Latency of calls to AI providers and Supabase.",
+    ["provider", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "ccd_ai_upstream_in_flight",
+    "Upstream calls currently awaiting a response.",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+STREAM_TTFT = Histogram(
+    "ccd_ai_stream_ttft_seconds",
+    "Time from opening a model stream to its first text delta.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+STREAM_TOKENS_PER_SECOND = Histogram(
+    "ccd_ai_stream_tokens_per_second",
+    "Output tokens per second after the first delta of a model stream.",
+    ["route"],
+    buckets=(5, 10, 20, 30, 40, 60, 80, 100, 150, 200, 300),
+)
+STREAM_DELTAS = Counter(
+    "ccd_ai_stream_deltas_total",
+    "Text deltas received from model streams.",
+    ["route"],
+)
+STREAM_FRAMES = Counter(
+    "ccd_ai_stream_frames_total",
+    "SSE text frames sent to clients (deltas are coalesced into frames).",
+    ["route"],
+)
+STREAM_ABANDONED = Counter(
+    "ccd_ai_stream_abandoned_total",
+    "Model streams cancelled because the client disconnected.",
+    ["route"],
+)
+STREAM_ABANDONED_SAVED_TOKENS = Counter(
+    "ccd_ai_stream_abandoned_saved_tokens_total",
+    "Estimated output tokens not generated because the client disconnected: "
+    "the route's typical completed output (capped at max_tokens) minus what "
+    "was already streamed. Nothing is counted until a stream has completed.",
+    ["route"],
+)
+QUEUE_WAIT = Histogram(
+    "ccd_ai_queue_wait_seconds",
+    "Time work items spend queued before being processed.",
+    ["queue"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+CACHE_LOOKUPS = Counter(
+    "ccd_ai_cache_lookups_total",
+    "Cache lookups by cache, route and result (hit/miss).",
+    ["cache", "route", "result"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "ccd_ai_event_loop_lag_seconds",
+    "How late the event loop ran a timer that was due (time blocked by sync work).",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+LOCAL_ANALYSES = Counter(
+    "ccd_ai_local_analysis_total",
+    "Requested analyses served by the local engine vs sent to the LLM.",
+    ["analysis", "engine"],
+)
+
+
+@contextmanager
+def observe_upstream(provider: str, operation: str) -> Iterator[None]:
+    """Time an upstream call and record it with an ``ok``/``error`` outcome.
+
+    The call is also traced as a ``<provider> <operation>`` span.
+    """
+    in_flight = UPSTREAM_IN_FLIGHT.labels(provider)
+    in_flight.inc()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"{provider} {operation}", **{"peer.service": provider}):
+            yield
+        outcome = "ok"
+    finally:
+        in_flight.dec()
+        UPSTREAM_LATENCY.labels(provider, operation, outcome).observe(
+            time.perf_counter() - start
+        )
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """Sample event-loop lag every ``interval`` seconds until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        due = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - due))
+
+
+def _multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render() -> tuple[bytes, str]:
+    """Return the Prometheus exposition body and content type."""
+    if _multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int | None = None) -> None:
+    """Drop a worker's live gauges (default: this one's) from the multiprocess directory."""
+    if _multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests.
+
+    Routes are labelled by their path template (``/api/ai/chat/stream``,
+    ``/api/ai/profiles/{profile_id}``), read from ``scope["route"]`` once the
+    router has matched the request; raw paths are never used as labels.
+    Requests that match no route share the ``unmatched`` label so unknown
+    URLs cannot blow up label cardinality.
+
+    The in-flight gauge is labelled before routing, so it relies on routes
+    seen on earlier requests: static routes by exact path, routes with path
+    parameters by their path regex. Both tables are keyed by route, so they
+    stay as small as the route table no matter how many distinct URLs arrive.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._static: dict[tuple[str, str], str] = {}
+        self._templated: dict[str, re.Pattern] = {}
+
+    def _learn(self, scope: Scope, route: object) -> None:
+        template = route.path
+        if template == scope["path"]:
+            self._static[(scope["method"], template)] = template
+        elif getattr(route, "path_regex", None) is not None:
+            self._templated[template] = route.path_regex
+
+    def _label(self, scope: Scope) -> str:
+        label = self._static.get((scope["method"], scope["path"]))
+        if label is not None:
+            return label
+        for template, regex in self._templated.items():
+            if regex.match(scope["path"]):
+                return template
+        return "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(self._label(scope))
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                self._learn(scope, scope["route"])
+            REQUEST_LATENCY.labels(scope["method"], route or "unmatched", status).observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,115 @@
+"""Opt-in per-request sampling profiler.
+
+A request is profiled when it carries ``X-CCD-Profile: <diagnostics token>``
+or falls inside ``settings.profiling_sample_rate``. The profile is written to
+``settings.profiling_dir`` as a speedscope flamegraph (open it at
+https://www.speedscope.app) and its id is returned in the
+``X-CCD-Profile-Id`` response header; ``GET /api/ai/profiles/{id}`` serves it
+back to holders of the diagnostics token. Rendering, writing and pruning
+happen in a worker thread; each write keeps the newest
+``settings.profiling_max_files`` profiles and deletes any older than
+``settings.profiling_max_age_seconds``.
+
+Profiling needs the optional ``profiling`` extra (pyinstrument). Without it
+the middleware is not installed.
+"""
+
+import asyncio
+import importlib.util
+import os
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .tracing import diagnostics_authorized
+
+PROFILE_HEADER = b"x-ccd-profile"
+PROFILE_ID_HEADER = b"x-ccd-profile-id"
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def profiling_available() -> bool:
+    return importlib.util.find_spec("pyinstrument") is not None
+
+
+def profile_path(profile_id: str) -> Path | None:
+    """Location of a stored profile, or ``None`` for a malformed id."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    return Path(settings.profiling_dir) / f"{profile_id}.speedscope.json"
+
+
+def _prune(directory: Path) -> None:
+    cutoff = time.time() - settings.profiling_max_age_seconds
+    profiles = []
+    for path in directory.glob("*.speedscope.json"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    profiles.sort(reverse=True)
+    for rank, (mtime, path) in enumerate(profiles):
+        if rank >= settings.profiling_max_files or mtime < cutoff:
+            path.unlink(missing_ok=True)
+
+
+def _save(profiler, path: Path) -> None:
+    """Render ``profiler`` to ``path`` and prune old profiles (blocking)."""
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    try:
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_text(profiler.output(renderer=SpeedscopeRenderer()))
+        _prune(path.parent)
+    except OSError:
+        pass
+
+
+class ProfilingMiddleware:
+    """Runs pyinstrument around sampled or explicitly requested requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith("/api/ai/profiles/"):
+            # Fetching a profile with the token header must not create another one.
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < settings.profiling_sample_rate
+        if not sampled and not diagnostics_authorized(dict(scope["headers"]).get(PROFILE_HEADER)):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (PROFILE_ID_HEADER, profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        profiler = Profiler(interval=settings.profiling_interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            await asyncio.to_thread(_save, profiler, profile_path(profile_id))
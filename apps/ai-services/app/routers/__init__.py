@@ -4,5 +4,6 @@ from .analyze import router as analyze_router
 from .insights import router as insights_router
 from .embed import router as embed_router
 from .automation import router as automation_router
+from .cache import router as cache_router
 
-__all__ = ["chat_router", "generate_router", "analyze_router", "insights_router", "embed_router", "automation_router"]
+__all__ = ["chat_router", "generate_router", "analyze_router", "insights_router", "embed_router", "automation_router", "cache_router"]
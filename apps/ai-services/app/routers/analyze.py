@@ -1,12 +1,18 @@
 """Text analysis endpoint (sentiment, summary, categorize, keywords)."""
 
 import json
+import time
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from ..analyzers import LOCAL_MODEL, run_local_analyses
 from ..clients.anthropic_client import get_anthropic_client
 from ..config import settings
+from ..metrics import LOCAL_ANALYSES, observe_upstream
+from ..tracing import span
+from ..usage import record_usage
 
 router = APIRouter(prefix="/api/ai/analyze", tags=["analyze"])
 
@@ -38,46 +44,104 @@ class AnalyzeRequest(BaseModel):
     text: str
     analyses: list[str]
     context: dict | None = None
+    tenant_id: str | None = None
+    # "auto": local engine when confident, LLM otherwise; "local": local engine
+    # for every analysis it supports; "llm": always call the model.
+    engine: Literal["auto", "local", "llm"] = "auto"
 
 
 class AnalyzeResponse(BaseModel):
     results: dict
     model: str
     tokens_used: int | None = None
+    local_analyses: list[str] | None = None
 
 
 @router.post("/", response_model=AnalyzeResponse)
 async def analyze_text(body: AnalyzeRequest):
     """Perform one or more text analyses."""
-    # Build instruction for requested analyses
-    instructions = "\n".join(
-        ANALYSIS_INSTRUCTIONS[a]
-        for a in body.analyses
-        if a in ANALYSIS_INSTRUCTIONS
-    )
-    if not instructions:
+    requested = [a for a in body.analyses if a in ANALYSIS_INSTRUCTIONS]
+    if not requested:
         raise HTTPException(status_code=400, detail="No valid analyses requested")
 
-    user_prompt = (
-        f"Analyse the following text and return a JSON object with keys: "
-        f"{', '.join(body.analyses)}.\n\n{instructions}\n\nText to analyse:\n\n{body.text}"
-    )
+    # The local engine runs synchronously on the event loop.
+    if body.engine == "local" and len(body.text) > settings.local_analysis_hard_max_chars:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Text too long for engine='local' "
+                f"(max {settings.local_analysis_hard_max_chars} characters)"
+            ),
+        )
+
+    # Local fast path: short texts (or an explicit engine="local") are scored
+    # in-process and only the leftovers go to the model.
+    local_results: dict = {}
+    if settings.local_analysis_enabled and body.engine != "llm":
+        if body.engine == "local" or len(body.text) <= settings.local_analysis_max_chars:
+            with span("local.analyze"):
+                local_results = run_local_analyses(
+                    body.text,
+                    requested,
+                    tenant_id=body.tenant_id,
+                    min_confidence=(
+                        None if body.engine == "local" else settings.local_analysis_min_confidence
+                    ),
+                )
+
+    remaining = [a for a in requested if a not in local_results]
+    for analysis in requested:
+        LOCAL_ANALYSES.labels(analysis, "llm" if analysis in remaining else "local").inc()
+    if not remaining:
+        record_usage("analyze", tenant_id=body.tenant_id, model=LOCAL_MODEL)
+        return AnalyzeResponse(
+            results=local_results,
+            model=LOCAL_MODEL,
+            tokens_used=0,
+            local_analyses=list(local_results),
+        )
+
+    # Build instruction for the analyses left for the model
+    with span("prompt.build"):
+        instructions = "\n".join(ANALYSIS_INSTRUCTIONS[a] for a in remaining)
+
+        user_prompt = (
+            f"Analyse the following text and return a JSON object with keys: "
+            f"{', '.join(remaining)}.\n\n{instructions}\n\nText to analyse:\n\n{body.text}"
+        )
 
-    if body.context:
-        user_prompt += f"\n\nAdditional context: {json.dumps(body.context, default=str)}"
+        if body.context:
+            user_prompt += f"\n\nAdditional context: {json.dumps(body.context, default=str)}"
 
     client = get_anthropic_client()
 
+    started = time.perf_counter()
     try:
-        response = await client.messages.create(
+        with observe_upstream("anthropic", "messages.create"):
+            response = await client.messages.create(
+                model=settings.default_model,
+                max_tokens=2048,
+                system=ANALYSIS_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": user_prompt}],
+            )
+    except Exception as exc:
+        record_usage(
+            "analyze",
+            tenant_id=body.tenant_id,
             model=settings.default_model,
-            max_tokens=2048,
-            system=ANALYSIS_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_prompt}],
+            upstream_latency_ms=(time.perf_counter() - started) * 1000,
+            status="error",
         )
-    except Exception as exc:
         raise HTTPException(status_code=502, detail=f"AI provider error: {exc}") from exc
 
+    record_usage(
+        "analyze",
+        tenant_id=body.tenant_id,
+        model=response.model,
+        usage=response.usage,
+        upstream_latency_ms=(time.perf_counter() - started) * 1000,
+    )
+
     raw = response.content[0].text if response.content else "{}"
     tokens = (
         (response.usage.input_tokens + response.usage.output_tokens)
@@ -86,9 +150,18 @@ async def analyze_text(body: AnalyzeRequest):
     )
 
     # Parse JSON response
-    try:
-        results = json.loads(raw)
-    except json.JSONDecodeError:
-        results = {"raw": raw}
-
-    return AnalyzeResponse(results=results, model=response.model, tokens_used=tokens)
+    with span("response.parse"):
+        try:
+            results = json.loads(raw)
+        except json.JSONDecodeError:
+            results = {"raw": raw}
+    if not isinstance(results, dict):
+        results = {"raw": results}
+    results.update(local_results)
+
+    return AnalyzeResponse(
+        results=results,
+        model=response.model,
+        tokens_used=tokens,
+        local_analyses=list(local_results) or None,
+    )
@@ -1,10 +1,15 @@
 """Automation execution endpoint — runs AI-powered automations by type."""
 
+import time
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from anthropic import Anthropic
 
+from ..clients.anthropic_client import get_sync_anthropic_client
 from ..config import settings
+from ..metrics import observe_upstream
+from ..tracing import span
+from ..usage import record_usage
 
 router = APIRouter(prefix="/api/ai", tags=["automation"])
 
@@ -38,13 +43,13 @@ AUTOMATION_PROMPTS: dict[str, str] = {
 }
 
 
-def _get_anthropic_client() -> Anthropic:
+def _get_anthropic_client():
     if not settings.anthropic_api_key:
         raise HTTPException(
             status_code=503,
             detail="Anthropic API key not configured (set AI_ANTHROPIC_API_KEY)",
         )
-    return Anthropic(api_key=settings.anthropic_api_key)
+    return get_sync_anthropic_client()
 
 
 class AutomationRunRequest(BaseModel):
@@ -74,19 +79,29 @@ async def run_automation(body: AutomationRunRequest) -> AutomationRunResponse:
     client = _get_anthropic_client()
 
     # Build a user message from the config context
-    user_message = (
-        f"Automation type: {body.automation_type}\n"
-        f"Configuration: {body.automation_config}\n\n"
-        "Please analyse the available data and provide your results. "
-        "If no specific data is provided in the configuration, generate "
-        "sample recommendations based on common patterns for this type of automation."
-    )
+    with span("prompt.build"):
+        user_message = (
+            f"Automation type: {body.automation_type}\n"
+            f"Configuration: {body.automation_config}\n\n"
+            "Please analyse the available data and provide your results. "
+            "If no specific data is provided in the configuration, generate "
+            "sample recommendations based on common patterns for this type of automation."
+        )
 
-    response = client.messages.create(
-        model=settings.default_model,
-        max_tokens=settings.max_tokens,
-        system=system_prompt,
-        messages=[{"role": "user", "content": user_message}],
+    started = time.perf_counter()
+    with observe_upstream("anthropic", "messages.create"):
+        response = client.messages.create(
+            model=settings.default_model,
+            max_tokens=settings.max_tokens,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_message}],
+        )
+    record_usage(
+        "automation",
+        tenant_id=body.tenant_id,
+        model=response.model,
+        usage=response.usage,
+        upstream_latency_ms=(time.perf_counter() - started) * 1000,
     )
 
     content = response.content[0].text if response.content else ""
@@ -0,0 +1,45 @@
+"""Semantic cache inspection and invalidation endpoints."""
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from ..cache import semantic_cache
+
+router = APIRouter(prefix="/api/ai/cache", tags=["cache"])
+
+
+class InvalidateRequest(BaseModel):
+    entry_ids: list[str] | None = None
+    tenant_id: str | None = None
+    route: str | None = None
+
+
+class InvalidateResponse(BaseModel):
+    invalidated: int
+
+
+@router.get("/stats")
+async def cache_stats():
+    """Hit/miss counters, hit rate per route and current cache size."""
+    return {
+        "enabled_routes": sorted(semantic_cache.routes),
+        "disabled_reason": semantic_cache.disabled_reason,
+        "threshold": semantic_cache.threshold,
+        **semantic_cache.stats(),
+    }
+
+
+@router.post("/invalidate", response_model=InvalidateResponse)
+async def invalidate_cache(body: InvalidateRequest):
+    """Mark cached answers invalid by id, or drop a tenant's / route's entries."""
+    if not body.entry_ids and body.tenant_id is None and body.route is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide 'entry_ids', 'tenant_id' or 'route'",
+        )
+    count = semantic_cache.invalidate(
+        entry_ids=body.entry_ids,
+        tenant_id=body.tenant_id,
+        route=body.route,
+    )
+    return InvalidateResponse(invalidated=count)
@@ -1,17 +1,36 @@
 """Chat completion and streaming endpoints."""
 
+import asyncio
 import json
+import time
+from types import SimpleNamespace
 from typing import AsyncGenerator
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
+from ..cache import request_namespace, semantic_cache
 from ..clients.anthropic_client import get_anthropic_client
 from ..config import settings
+from ..metrics import (
+    STREAM_ABANDONED,
+    STREAM_ABANDONED_SAVED_TOKENS,
+    STREAM_DELTAS,
+    STREAM_FRAMES,
+    STREAM_TOKENS_PER_SECOND,
+    STREAM_TTFT,
+    observe_upstream,
+)
+from ..streaming import OutputLength, coalesce
+from ..tracing import span
+from ..usage import record_usage
 
 router = APIRouter(prefix="/api/ai/chat", tags=["chat"])
 
+# Typical output of completed streams, for the abandoned-stream savings metric.
+_stream_output = OutputLength()
+
 # ---------------------------------------------------------------------------
 # System prompts per module context
 # ---------------------------------------------------------------------------
@@ -73,6 +92,8 @@ class ChatRequest(BaseModel):
     module_context: str | None = None
     entity_context: dict | None = None
     max_tokens: int | None = None
+    tenant_id: str | None = None
+    use_cache: bool = True
 
 
 class ChatResponse(BaseModel):
@@ -80,6 +101,8 @@ class ChatResponse(BaseModel):
     model: str
     tokens_used: int | None = None
     stop_reason: str | None = None
+    cached: bool = False
+    cache_id: str | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -98,6 +121,13 @@ def _build_system_prompt(module_context: str | None, entity_context: dict | None
     return base
 
 
+def _cache_namespace(body: ChatRequest) -> str:
+    # Only the latest user turn is matched by similarity; everything that
+    # shapes the answer before it has to match exactly.
+    history = [(m.role, m.content) for m in body.messages[:-1]]
+    return request_namespace(body.module_context, body.entity_context, body.max_tokens, history)
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -105,20 +135,60 @@ def _build_system_prompt(module_context: str | None, entity_context: dict | None
 @router.post("/completions", response_model=ChatResponse)
 async def chat_completion(body: ChatRequest):
     """Non-streaming chat completion."""
+    use_cache = (
+        semantic_cache.accepts_tenant(body.tenant_id)
+        and body.use_cache
+        and semantic_cache.enabled_for("chat")
+        and bool(body.messages)
+        and body.messages[-1].role == "user"
+    )
+    if use_cache:
+        with span("cache.lookup", route="chat"):
+            cache_namespace = _cache_namespace(body)
+            hit = semantic_cache.lookup(
+                "chat", body.tenant_id, cache_namespace, body.messages[-1].content
+            )
+        if hit is not None:
+            record_usage(
+                "chat.completions",
+                tenant_id=body.tenant_id,
+                model=hit.value.get("model"),
+                cached=True,
+            )
+            return ChatResponse(**hit.value, tokens_used=0, cached=True, cache_id=hit.id)
+
     client = get_anthropic_client()
-    system_prompt = _build_system_prompt(body.module_context, body.entity_context)
+    with span("prompt.build"):
+        system_prompt = _build_system_prompt(body.module_context, body.entity_context)
     max_tokens = body.max_tokens or settings.max_tokens
 
+    started = time.perf_counter()
     try:
-        response = await client.messages.create(
+        with observe_upstream("anthropic", "messages.create"):
+            response = await client.messages.create(
+                model=settings.default_model,
+                max_tokens=max_tokens,
+                system=system_prompt,
+                messages=[{"role": m.role, "content": m.content} for m in body.messages],
+            )
+    except Exception as exc:
+        record_usage(
+            "chat.completions",
+            tenant_id=body.tenant_id,
             model=settings.default_model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=[{"role": m.role, "content": m.content} for m in body.messages],
+            upstream_latency_ms=(time.perf_counter() - started) * 1000,
+            status="error",
         )
-    except Exception as exc:
         raise HTTPException(status_code=502, detail=f"AI provider error: {exc}") from exc
 
+    record_usage(
+        "chat.completions",
+        tenant_id=body.tenant_id,
+        model=response.model,
+        usage=response.usage,
+        upstream_latency_ms=(time.perf_counter() - started) * 1000,
+    )
+
     content = response.content[0].text if response.content else ""
     tokens = (
         (response.usage.input_tokens + response.usage.output_tokens)
@@ -126,11 +196,24 @@ async def chat_completion(body: ChatRequest):
         else None
     )
 
+    cache_id = None
+    if use_cache and content:
+        with span("cache.store", route="chat"):
+            entry = semantic_cache.store(
+                "chat",
+                body.tenant_id,
+                cache_namespace,
+                body.messages[-1].content,
+                {"content": content, "model": response.model, "stop_reason": response.stop_reason},
+            )
+        cache_id = entry.id
+
     return ChatResponse(
         content=content,
         model=response.model,
         tokens_used=tokens,
         stop_reason=response.stop_reason,
+        cache_id=cache_id,
     )
 
 
@@ -138,36 +221,113 @@ async def chat_completion(body: ChatRequest):
 async def chat_stream(body: ChatRequest):
     """SSE streaming chat completion."""
     client = get_anthropic_client()
-    system_prompt = _build_system_prompt(body.module_context, body.entity_context)
+    with span("prompt.build"):
+        system_prompt = _build_system_prompt(body.module_context, body.entity_context)
     max_tokens = body.max_tokens or settings.max_tokens
+    # Set by sse-starlette when the client disconnects; a cancellation
+    # without it comes from server shutdown.
+    disconnected = False
+
+    async def on_client_close(message: dict) -> None:
+        nonlocal disconnected
+        disconnected = True
 
     async def event_generator() -> AsyncGenerator[dict, None]:
+        started = time.perf_counter()
+        ttft_ms = None
+        streamed_chars = 0
+        input_tokens = 0
         try:
-            async with client.messages.stream(
-                model=settings.default_model,
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[{"role": m.role, "content": m.content} for m in body.messages],
-            ) as stream:
-                async for text in stream.text_stream:
-                    yield {"event": "text", "data": text}
-
-                # After stream finishes, send final metadata
-                final = await stream.get_final_message()
-                tokens = (
-                    (final.usage.input_tokens + final.usage.output_tokens)
-                    if final.usage
-                    else None
+            with observe_upstream("anthropic", "messages.stream"):
+                async with client.messages.stream(
+                    model=settings.default_model,
+                    max_tokens=max_tokens,
+                    system=system_prompt,
+                    messages=[{"role": m.role, "content": m.content} for m in body.messages],
+                ) as stream:
+                    async for deltas in coalesce(
+                        stream.text_stream,
+                        interval=settings.stream_flush_interval_ms / 1000,
+                        max_chars=settings.stream_flush_max_chars,
+                    ):
+                        if ttft_ms is None:
+                            ttft_ms = (time.perf_counter() - started) * 1000
+                            input_tokens = stream.current_message_snapshot.usage.input_tokens
+                        text = "".join(deltas)
+                        streamed_chars += len(text)
+                        STREAM_DELTAS.labels("chat.stream").inc(len(deltas))
+                        STREAM_FRAMES.labels("chat.stream").inc()
+                        yield {"event": "text", "data": text}
+
+                    # After stream finishes, send final metadata
+                    final = await stream.get_final_message()
+                    finished = time.perf_counter()
+                    if ttft_ms is not None:
+                        STREAM_TTFT.labels("chat.stream").observe(ttft_ms / 1000)
+                        generation_seconds = finished - started - ttft_ms / 1000
+                        if final.usage and generation_seconds > 0:
+                            STREAM_TOKENS_PER_SECOND.labels("chat.stream").observe(
+                                final.usage.output_tokens / generation_seconds
+                            )
+                    if final.usage:
+                        _stream_output.observe(final.usage.output_tokens)
+                    record_usage(
+                        "chat.stream",
+                        tenant_id=body.tenant_id,
+                        model=final.model,
+                        usage=final.usage,
+                        upstream_latency_ms=(finished - started) * 1000,
+                        ttft_ms=ttft_ms,
+                    )
+                    tokens = (
+                        (final.usage.input_tokens + final.usage.output_tokens)
+                        if final.usage
+                        else None
+                    )
+                    yield {
+                        "event": "done",
+                        "data": json.dumps({
+                            "model": final.model,
+                            "tokens_used": tokens,
+                            "stop_reason": final.stop_reason,
+                        }),
+                    }
+        except asyncio.CancelledError:
+            # sse-starlette cancels this generator when the client goes away
+            # or the server shuts down; leaving the ``async with`` above closes
+            # the upstream connection, which stops generation. Output tokens
+            # are estimated from what was streamed, at ~4 chars each; the
+            # saving is what a typical completed stream would have added.
+            output_tokens = streamed_chars // 4
+            if disconnected:
+                STREAM_ABANDONED.labels("chat.stream").inc()
+                STREAM_ABANDONED_SAVED_TOKENS.labels("chat.stream").inc(
+                    _stream_output.remaining(output_tokens, max_tokens)
                 )
-                yield {
-                    "event": "done",
-                    "data": json.dumps({
-                        "model": final.model,
-                        "tokens_used": tokens,
-                        "stop_reason": final.stop_reason,
-                    }),
-                }
+            record_usage(
+                "chat.stream",
+                tenant_id=body.tenant_id,
+                model=settings.default_model,
+                usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+                upstream_latency_ms=(time.perf_counter() - started) * 1000,
+                ttft_ms=ttft_ms,
+                status="cancelled" if disconnected else "error",
+            )
+            raise
         except Exception as exc:
+            record_usage(
+                "chat.stream",
+                tenant_id=body.tenant_id,
+                model=settings.default_model,
+                upstream_latency_ms=(time.perf_counter() - started) * 1000,
+                ttft_ms=ttft_ms,
+                status="error",
+            )
             yield {"event": "error", "data": str(exc)}
 
-    return EventSourceResponse(event_generator())
+    # Pings double as heartbeats so proxies neither buffer nor time out the stream.
+    return EventSourceResponse(
+        event_generator(),
+        ping=settings.stream_ping_seconds,
+        client_close_handler_callable=on_client_close,
+    )
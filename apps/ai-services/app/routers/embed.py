@@ -1,23 +1,28 @@
 """Embedding endpoint — generates vector embeddings via OpenAI."""
 
+import time
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from openai import OpenAI
 
+from ..clients.openai_client import get_openai_client
 from ..config import settings
+from ..metrics import observe_upstream
+from ..tracing import span
+from ..usage import record_usage
 
 router = APIRouter(prefix="/api/ai", tags=["embeddings"])
 
 EMBED_MODEL = "text-embedding-3-small"  # 1536 dimensions
 
 
-def _get_openai_client() -> OpenAI:
+def _get_openai_client():
     if not settings.openai_api_key:
         raise HTTPException(
             status_code=503,
             detail="OpenAI API key not configured (set AI_OPENAI_API_KEY)",
         )
-    return OpenAI(api_key=settings.openai_api_key)
+    return get_openai_client()
 
 
 class EmbedRequest(BaseModel):
@@ -25,6 +30,7 @@ class EmbedRequest(BaseModel):
 
     text: str | None = None
     texts: list[str] | None = Field(None, max_length=100)
+    tenant_id: str | None = None
 
 
 class SingleEmbedResponse(BaseModel):
@@ -54,7 +60,16 @@ async def create_embedding(body: EmbedRequest):
 
     # --- single text ---
     if body.text is not None:
-        result = client.embeddings.create(model=EMBED_MODEL, input=body.text)
+        started = time.perf_counter()
+        with observe_upstream("openai", "embeddings.create"):
+            result = client.embeddings.create(model=EMBED_MODEL, input=body.text)
+        record_usage(
+            "embed",
+            tenant_id=body.tenant_id,
+            model=result.model,
+            usage=result.usage,
+            upstream_latency_ms=(time.perf_counter() - started) * 1000,
+        )
         return SingleEmbedResponse(
             embedding=result.data[0].embedding,
             model=result.model,
@@ -66,8 +81,18 @@ async def create_embedding(body: EmbedRequest):
     if len(texts) == 0:
         raise HTTPException(status_code=400, detail="'texts' array must not be empty")
 
-    result = client.embeddings.create(model=EMBED_MODEL, input=texts)
-    embeddings = [item.embedding for item in result.data]
+    started = time.perf_counter()
+    with observe_upstream("openai", "embeddings.create"):
+        result = client.embeddings.create(model=EMBED_MODEL, input=texts)
+    record_usage(
+        "embed",
+        tenant_id=body.tenant_id,
+        model=result.model,
+        usage=result.usage,
+        upstream_latency_ms=(time.perf_counter() - started) * 1000,
+    )
+    with span("response.build", count=len(result.data)):
+        embeddings = [item.embedding for item in result.data]
 
     return BatchEmbedResponse(
         embeddings=embeddings,
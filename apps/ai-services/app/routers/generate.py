@@ -1,10 +1,16 @@
 """Content generation endpoint."""
 
+import time
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from ..cache import request_namespace, semantic_cache
 from ..clients.anthropic_client import get_anthropic_client
 from ..config import settings
+from ..metrics import observe_upstream
+from ..tracing import span
+from ..usage import record_usage
 
 router = APIRouter(prefix="/api/ai/generate", tags=["generate"])
 
@@ -55,6 +61,8 @@ class GenerateRequest(BaseModel):
     prompt: str
     context: dict | None = None
     max_tokens: int | None = None
+    tenant_id: str | None = None
+    use_cache: bool = True
 
 
 class GenerateResponse(BaseModel):
@@ -62,6 +70,8 @@ class GenerateResponse(BaseModel):
     type: str
     model: str
     tokens_used: int | None = None
+    cached: bool = False
+    cache_id: str | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -71,24 +81,57 @@ class GenerateResponse(BaseModel):
 @router.post("/", response_model=GenerateResponse)
 async def generate_content(body: GenerateRequest):
     """Generate content of a specific type."""
-    system_prompt = GENERATION_PROMPTS.get(body.type, GENERATION_PROMPTS["custom"])
-
-    if body.context:
-        system_prompt += f"\n\nAdditional context: {body.context}"
+    use_cache = (
+        semantic_cache.accepts_tenant(body.tenant_id)
+        and body.use_cache
+        and semantic_cache.enabled_for("generate")
+    )
+    cache_namespace = request_namespace(body.type, body.context, body.max_tokens)
+    if use_cache:
+        with span("cache.lookup", route="generate"):
+            hit = semantic_cache.lookup("generate", body.tenant_id, cache_namespace, body.prompt)
+        if hit is not None:
+            record_usage(
+                "generate", tenant_id=body.tenant_id, model=hit.value.get("model"), cached=True
+            )
+            return GenerateResponse(**hit.value, tokens_used=0, cached=True, cache_id=hit.id)
+
+    with span("prompt.build"):
+        system_prompt = GENERATION_PROMPTS.get(body.type, GENERATION_PROMPTS["custom"])
+
+        if body.context:
+            system_prompt += f"\n\nAdditional context: {body.context}"
 
     client = get_anthropic_client()
     max_tokens = body.max_tokens or settings.max_tokens
 
+    started = time.perf_counter()
     try:
-        response = await client.messages.create(
+        with observe_upstream("anthropic", "messages.create"):
+            response = await client.messages.create(
+                model=settings.default_model,
+                max_tokens=max_tokens,
+                system=system_prompt,
+                messages=[{"role": "user", "content": body.prompt}],
+            )
+    except Exception as exc:
+        record_usage(
+            "generate",
+            tenant_id=body.tenant_id,
             model=settings.default_model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=[{"role": "user", "content": body.prompt}],
+            upstream_latency_ms=(time.perf_counter() - started) * 1000,
+            status="error",
         )
-    except Exception as exc:
         raise HTTPException(status_code=502, detail=f"AI provider error: {exc}") from exc
 
+    record_usage(
+        "generate",
+        tenant_id=body.tenant_id,
+        model=response.model,
+        usage=response.usage,
+        upstream_latency_ms=(time.perf_counter() - started) * 1000,
+    )
+
     content = response.content[0].text if response.content else ""
     tokens = (
         (response.usage.input_tokens + response.usage.output_tokens)
@@ -96,9 +139,22 @@ async def generate_content(body: GenerateRequest):
         else None
     )
 
+    cache_id = None
+    if use_cache and content:
+        with span("cache.store", route="generate"):
+            entry = semantic_cache.store(
+                "generate",
+                body.tenant_id,
+                cache_namespace,
+                body.prompt,
+                {"content": content, "type": body.type, "model": response.model},
+            )
+        cache_id = entry.id
+
     return GenerateResponse(
         content=content,
         type=body.type,
         model=response.model,
         tokens_used=tokens,
+        cache_id=cache_id,
     )
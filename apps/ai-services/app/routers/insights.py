@@ -1,13 +1,22 @@
 """AI insights generation endpoint."""
 
+import asyncio
 import json
+import time
+from typing import AsyncGenerator
 
+import anyio
+import httpx
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+from sse_starlette.sse import EventSourceResponse
 
 from ..clients.anthropic_client import get_anthropic_client
 from ..clients.supabase_client import SupabaseClient
 from ..config import settings
+from ..metrics import QUEUE_WAIT, observe_upstream
+from ..tracing import span
+from ..usage import record_usage
 
 router = APIRouter(prefix="/api/ai/insights", tags=["insights"])
 
@@ -62,6 +71,36 @@ class InsightsRequest(BaseModel):
     additional_context: str | None = None
 
 
+class BulkInsightsRequest(BaseModel):
+    tenant_id: str
+    categories: list[str] = Field(
+        default_factory=lambda: list(CATEGORY_DATA_QUERIES),
+        min_length=1,
+        max_length=len(CATEGORY_DATA_QUERIES),
+    )
+    additional_context: str | None = None
+
+    @field_validator("categories", mode="before")
+    @classmethod
+    def _dedupe_categories(cls, value: object) -> object:
+        # Before the length limit, so repeats of known names are not rejected.
+        if isinstance(value, list) and all(isinstance(c, str) for c in value):
+            return list(dict.fromkeys(value))
+        return value
+
+    @field_validator("categories")
+    @classmethod
+    def _known_categories(cls, value: list[str]) -> list[str]:
+        # Each category costs a model call, so unknown names are rejected
+        # rather than answered without data.
+        unknown = [c for c in value if c not in CATEGORY_DATA_QUERIES]
+        if unknown:
+            raise ValueError(
+                f"Unknown categories {unknown}; expected any of {list(CATEGORY_DATA_QUERIES)}"
+            )
+        return value
+
+
 class Insight(BaseModel):
     title: str
     summary: str
@@ -76,47 +115,78 @@ class InsightsResponse(BaseModel):
     tokens_used: int | None = None
 
 
-@router.post("/generate", response_model=InsightsResponse)
-async def generate_insights(body: InsightsRequest):
-    """Fetch module data from Supabase and generate AI insights."""
-    query_config = CATEGORY_DATA_QUERIES.get(body.category)
-    data_context = ""
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+async def _fetch_category_data(
+    category: str, tenant_id: str, http: httpx.AsyncClient | None = None
+) -> str:
+    """Return the category's recent rows as JSON prompt context."""
+    query_config = CATEGORY_DATA_QUERIES.get(category)
+    if not query_config:
+        return "No specific data available for this category."
+
+    try:
+        sb = SupabaseClient(http)
+        rows = await sb.query(
+            query_config["table"],
+            select=query_config["select"],
+            filters={"tenant_id": f"eq.{tenant_id}"},
+            order=query_config.get("order"),
+            limit=query_config.get("limit"),
+        )
+        with span("data.serialize", rows=len(rows)):
+            return json.dumps(rows, default=str)
+    except Exception:
+        return "Unable to fetch module data — generate general insights instead."
 
-    if query_config:
-        try:
-            sb = SupabaseClient()
-            rows = await sb.query(
-                query_config["table"],
-                select=query_config["select"],
-                filters={"tenant_id": f"eq.{body.tenant_id}"},
-                order=query_config.get("order"),
-                limit=query_config.get("limit"),
-            )
-            data_context = json.dumps(rows, default=str)
-        except Exception:
-            data_context = "Unable to fetch module data — generate general insights instead."
-    else:
-        data_context = "No specific data available for this category."
-
-    user_prompt = (
-        f"Category: {body.category}\n\n"
-        f"Data:\n{data_context}"
-    )
-    if body.additional_context:
-        user_prompt += f"\n\nAdditional context: {body.additional_context}"
+
+async def _generate_category_insights(
+    category: str,
+    tenant_id: str,
+    data_context: str,
+    additional_context: str | None,
+    *,
+    route: str = "insights",
+) -> InsightsResponse:
+    with span("prompt.build"):
+        user_prompt = (
+            f"Category: {category}\n\n"
+            f"Data:\n{data_context}"
+        )
+        if additional_context:
+            user_prompt += f"\n\nAdditional context: {additional_context}"
 
     client = get_anthropic_client()
 
+    started = time.perf_counter()
     try:
-        response = await client.messages.create(
+        with observe_upstream("anthropic", "messages.create"):
+            response = await client.messages.create(
+                model=settings.default_model,
+                max_tokens=2048,
+                system=INSIGHT_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": user_prompt}],
+            )
+    except Exception as exc:
+        record_usage(
+            route,
+            tenant_id=tenant_id,
             model=settings.default_model,
-            max_tokens=2048,
-            system=INSIGHT_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_prompt}],
+            upstream_latency_ms=(time.perf_counter() - started) * 1000,
+            status="error",
         )
-    except Exception as exc:
         raise HTTPException(status_code=502, detail=f"AI provider error: {exc}") from exc
 
+    record_usage(
+        route,
+        tenant_id=tenant_id,
+        model=response.model,
+        usage=response.usage,
+        upstream_latency_ms=(time.perf_counter() - started) * 1000,
+    )
+
     raw = response.content[0].text if response.content else "[]"
     tokens = (
         (response.usage.input_tokens + response.usage.output_tokens)
@@ -124,24 +194,111 @@ async def generate_insights(body: InsightsRequest):
         else None
     )
 
-    try:
-        parsed = json.loads(raw)
-        if isinstance(parsed, dict) and "insights" in parsed:
-            parsed = parsed["insights"]
-        insights = [Insight(**i) for i in parsed] if isinstance(parsed, list) else []
-    except (json.JSONDecodeError, TypeError):
-        insights = [
-            Insight(
-                title="AI Analysis",
-                summary=raw[:200],
-                type="general",
-                details={"raw_response": raw},
-            )
-        ]
+    with span("response.parse"):
+        try:
+            parsed = json.loads(raw)
+            if isinstance(parsed, dict) and "insights" in parsed:
+                parsed = parsed["insights"]
+            insights = [Insight(**i) for i in parsed] if isinstance(parsed, list) else []
+        except (json.JSONDecodeError, TypeError):
+            insights = [
+                Insight(
+                    title="AI Analysis",
+                    summary=raw[:200],
+                    type="general",
+                    details={"raw_response": raw},
+                )
+            ]
 
     return InsightsResponse(
         insights=insights,
-        category=body.category,
+        category=category,
         model=response.model,
         tokens_used=tokens,
     )
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+@router.post("/generate", response_model=InsightsResponse)
+async def generate_insights(body: InsightsRequest):
+    """Fetch module data from Supabase and generate AI insights."""
+    data_context = await _fetch_category_data(body.category, body.tenant_id)
+    return await _generate_category_insights(
+        body.category, body.tenant_id, data_context, body.additional_context
+    )
+
+
+@router.post("/generate/bulk")
+async def generate_insights_bulk(body: BulkInsightsRequest):
+    """Generate insights for several categories, streamed as SSE as each one finishes.
+
+    All category datasets are fetched at once over one pooled HTTP client;
+    model calls run in parallel, at most ``settings.insights_max_concurrency``
+    at a time. Events: ``insights`` (an ``InsightsResponse`` per category),
+    ``error`` (``{"category", "detail"}`` for a category that failed) and a
+    final ``done`` with counts and the elapsed time.
+    """
+    categories = body.categories
+
+    async def event_generator() -> AsyncGenerator[dict, None]:
+        started = time.perf_counter()
+        model_slots = asyncio.Semaphore(settings.insights_max_concurrency)
+        failed = 0
+
+        async with httpx.AsyncClient() as http:
+
+            async def run(category: str) -> InsightsResponse:
+                data_context = await _fetch_category_data(category, body.tenant_id, http)
+                queued = time.perf_counter()
+                async with model_slots:
+                    QUEUE_WAIT.labels("insights").observe(time.perf_counter() - queued)
+                    return await _generate_category_insights(
+                        category,
+                        body.tenant_id,
+                        data_context,
+                        body.additional_context,
+                        route="insights.bulk",
+                    )
+
+            tasks = {asyncio.create_task(run(category)): category for category in categories}
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        try:
+                            result = task.result()
+                        except Exception as exc:
+                            failed += 1
+                            detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+                            yield {
+                                "event": "error",
+                                "data": json.dumps({"category": tasks[task], "detail": detail}),
+                            }
+                            continue
+                        yield {"event": "insights", "data": result.model_dump_json()}
+            finally:
+                # Client disconnected: stop the categories still in flight and
+                # let them unwind before the shared client closes. The shield
+                # keeps the surrounding cancellation from interrupting the wait.
+                for task in pending:
+                    task.cancel()
+                with anyio.CancelScope(shield=True):
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+        yield {
+            "event": "done",
+            "data": json.dumps({
+                "categories": len(categories),
+                "completed": len(categories) - failed,
+                "failed": failed,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            }),
+        }
+
+    return EventSourceResponse(event_generator(), ping=settings.stream_ping_seconds)
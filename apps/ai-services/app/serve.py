@@ -0,0 +1,137 @@
+"""Production entry point: preload the app once, then fork the workers.
+
+``uvicorn --workers N`` starts N fresh interpreters, each importing the app
+and the provider SDKs on its own. Here the parent imports everything (see
+``app.warmup.PRELOAD_MODULES``), freezes the GC so those objects are not
+written to again, and forks: workers share the parent's pages copy-on-write
+and start accepting connections on the inherited socket straight away. Each
+worker still builds its own clients and reports ``/ready`` once warm.
+
+Workers that die are replaced; SIGTERM/SIGINT stop them all gracefully.
+Process-local state is not shared between workers, which is why the
+semantic cache is disabled when ``AI_WORKERS`` is above 1.
+
+Usage::
+
+    AI_WORKERS=4 python -m app.serve     # listens on $PORT (default AI_PORT)
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from .config import settings
+
+logger = logging.getLogger("app.serve")
+
+# A worker that exits sooner than this after being forked is respawned with a delay.
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+
+def _reset_multiprocess_dir() -> None:
+    # Samples left by a previous run would be summed into /metrics.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket) -> None:
+    server = uvicorn.Server(uvicorn.Config(app, log_level="debug" if settings.debug else "info"))
+    server.run(sockets=[sock])
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    _reset_multiprocess_dir()
+
+    started = time.perf_counter()
+    from .main import app
+    from .metrics import mark_worker_dead
+    from .warmup import preload
+
+    preload()
+    logger.info("Preloaded app in %.0f ms", (time.perf_counter() - started) * 1000)
+
+    host = settings.host
+    port = int(os.environ.get("PORT", settings.port))
+    sock = _bind(host, port)
+
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, float] = {}
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                _run_worker(app, sock)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+        logger.info("Started worker %d", pid)
+
+    def stop(signum: int, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Listening on http://%s:%d with %d workers", host, port, settings.workers)
+    for _ in range(max(1, settings.workers)):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started_at = children.pop(pid, None)
+        if started_at is None:
+            continue
+        if stopping:
+            continue
+        mark_worker_dead(pid)
+        logger.warning("Worker %d exited (status %d); restarting", pid, status)
+        if time.monotonic() - started_at < RESPAWN_BACKOFF_SECONDS:
+            time.sleep(RESPAWN_BACKOFF_SECONDS)
+        spawn()
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
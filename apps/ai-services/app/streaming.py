@@ -0,0 +1,89 @@
+"""Helpers for server-sent event streams."""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator
+
+
+class OutputLength:
+    """Running estimate of how many output tokens a route's streams produce.
+
+    Fed with the output usage of streams that completed, as an exponentially
+    weighted mean, and used to estimate what an abandoned stream would still
+    have generated. The estimate is per process.
+    """
+
+    def __init__(self, weight: float = 0.1) -> None:
+        self._weight = weight
+        self.typical: float | None = None
+
+    def observe(self, output_tokens: int) -> None:
+        if self.typical is None:
+            self.typical = float(output_tokens)
+        else:
+            self.typical += self._weight * (output_tokens - self.typical)
+
+    def remaining(self, streamed_tokens: int, max_tokens: int) -> int:
+        """Tokens a stream cut off after ``streamed_tokens`` would still have produced."""
+        if self.typical is None:
+            return 0
+        return max(0, round(min(self.typical, max_tokens)) - streamed_tokens)
+
+
+async def coalesce(
+    deltas: AsyncIterable[str], *, interval: float, max_chars: int
+) -> AsyncIterator[list[str]]:
+    """Group streamed text deltas into batches that become one SSE frame each.
+
+    The first delta is passed through on its own so time-to-first-token is
+    unaffected. After that, deltas are buffered until ``interval`` seconds
+    have passed since the first buffered one or ``max_chars`` characters are
+    waiting, whichever comes first. ``interval <= 0`` disables coalescing.
+    """
+    iterator = deltas.__aiter__()
+    if interval <= 0:
+        async for delta in iterator:
+            yield [delta]
+        return
+
+    loop = asyncio.get_running_loop()
+    batch: list[str] = []
+    size = 0
+    deadline: float | None = None
+    first = True
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if done:
+                task, pending = pending, None
+                try:
+                    delta = task.result()
+                except StopAsyncIteration:
+                    break
+                if first:
+                    first = False
+                    yield [delta]
+                    continue
+                if not batch:
+                    deadline = loop.time() + interval
+                batch.append(delta)
+                size += len(delta)
+                if size < max_chars:
+                    continue
+
+            # Flush: the interval elapsed or the batch is full.
+            if batch:
+                yield batch
+            batch, size, deadline = [], 0, None
+
+        if batch:
+            yield batch
+    finally:
+        if pending is not None:
+            # Not awaited: this runs while the stream is being torn down.
+            pending.cancel()
+            pending.add_done_callback(lambda t: t.cancelled() or t.exception())
@@ -0,0 +1,222 @@
+"""Lightweight request span tracing with an OTLP/JSON file exporter.
+
+Call sites wrap interesting work in ``with span("prompt.build"):``. Unless the
+current request was picked for tracing (sampling rate or the diagnostics
+header, see :class:`TracingMiddleware`) ``span()`` returns a shared no-op
+context manager, so instrumented code pays one context-variable lookup.
+
+Finished traces are appended to ``settings.tracing_export_path`` as one
+OTLP/JSON ``ExportTraceServiceRequest`` per line, the format read by the
+OpenTelemetry Collector's ``otlpjsonfile`` receiver.
+"""
+
+import hmac
+import json
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import ContextManager
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+TRACE_HEADER = b"x-ccd-trace"
+
+_NOOP = nullcontext()
+_trace: ContextVar["_Trace | None"] = ContextVar("ccd_trace", default=None)
+_current: ContextVar["_Span | None"] = ContextVar("ccd_span", default=None)
+
+# OTLP enums
+_KIND_INTERNAL = 1
+_KIND_SERVER = 2
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+def _attribute(key: str, value: object) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class _Trace:
+    def __init__(self, trace_id: str) -> None:
+        self.trace_id = trace_id
+        self.spans: list[dict] = []
+
+
+class _Span:
+    def __init__(
+        self, trace: _Trace, name: str, attributes: dict, *, kind: int = _KIND_INTERNAL
+    ) -> None:
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+        self.kind = kind
+        self.span_id = os.urandom(8).hex()
+        self.parent_id: str | None = None
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+    def start(self) -> None:
+        parent = _current.get()
+        if self.parent_id is None and parent is not None:
+            self.parent_id = parent.span_id
+        self._start = time.time_ns()
+
+    def finish(self, exc_type: type | None = None, exc: BaseException | None = None) -> None:
+        end = time.time_ns()
+        record = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self._start),
+            "endTimeUnixNano": str(end),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": _STATUS_ERROR if exc_type else _STATUS_OK},
+        }
+        if self.parent_id:
+            record["parentSpanId"] = self.parent_id
+        if exc_type is not None:
+            record["status"]["message"] = f"{exc_type.__name__}: {exc}"
+        self.trace.spans.append(record)
+
+    def __enter__(self) -> "_Span":
+        self.start()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current.reset(self._token)
+        self.finish(exc_type, exc)
+
+
+def span(name: str, **attributes: object) -> ContextManager:
+    """Open a child span of the current request's trace (no-op when not tracing)."""
+    trace = _trace.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, attributes)
+
+
+class OTLPJsonFileExporter:
+    """Appends finished traces to a file as OTLP/JSON lines."""
+
+    def __init__(self, path: str, service_name: str) -> None:
+        self.path = path
+        self.resource = {"attributes": [_attribute("service.name", service_name)]}
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[dict]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": spans}],
+                }
+            ]
+        }
+        line = json.dumps(payload, separators=(",", ":")) + "\n"
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+        except OSError:
+            # Tracing must never fail the request it describes.
+            pass
+
+
+def _parse_traceparent(value: str) -> tuple[str, str] | None:
+    # W3C trace context: version-traceid-parentid-flags
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def diagnostics_authorized(value: bytes | str | None) -> bool:
+    """True when ``value`` matches the configured diagnostics token."""
+    if not settings.diagnostics_token or not value:
+        return False
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    return hmac.compare_digest(value, settings.diagnostics_token)
+
+
+class TracingMiddleware:
+    """Starts a trace for sampled requests and exports it when the response ends.
+
+    A request is traced when ``random() < settings.tracing_sample_rate`` or
+    when it carries ``X-CCD-Trace: <diagnostics token>``. An incoming W3C
+    ``traceparent`` header is honoured so spans join the caller's trace.
+    """
+
+    def __init__(self, app: ASGIApp, exporter: OTLPJsonFileExporter) -> None:
+        self.app = app
+        self.exporter = exporter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        sampled = random.random() < settings.tracing_sample_rate
+        if not sampled and not diagnostics_authorized(headers.get(TRACE_HEADER)):
+            await self.app(scope, receive, send)
+            return
+
+        parent = _parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        trace = _Trace(parent[0] if parent else os.urandom(16).hex())
+        root = _Span(
+            trace,
+            f"{scope['method']} {scope['path']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            kind=_KIND_SERVER,
+        )
+        if parent:
+            root.parent_id = parent[1]
+        send_span: _Span | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal send_span
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                # Everything from the first header byte to the last body chunk
+                # (serialisation of streamed bodies included).
+                send_span = _Span(trace, "response.send", {})
+                send_span.parent_id = root.span_id
+                send_span.start()
+            await send(message)
+            if (
+                message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+                and send_span is not None
+            ):
+                send_span.finish()
+                send_span = None
+
+        trace_token = _trace.set(trace)
+        try:
+            with root:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    if send_span is not None:
+                        send_span.finish()
+                    route = getattr(scope.get("route"), "path", None)
+                    if route is not None:
+                        root.name = f"{scope['method']} {route}"
+                        root.set_attribute("http.route", route)
+        finally:
+            _trace.reset(trace_token)
+            self.exporter.export(trace.spans)
@@ -0,0 +1,53 @@
+from ..config import settings
+from .recorder import UsageRecord, UsageRecorder
+
+usage_recorder = UsageRecorder(
+    table=settings.usage_table,
+    enabled=(
+        settings.usage_recording_enabled
+        and bool(settings.supabase_url and settings.supabase_service_role_key)
+    ),
+    batch_size=settings.usage_batch_size,
+    flush_interval=settings.usage_flush_interval_seconds,
+    max_buffer=settings.usage_max_buffer,
+)
+
+
+def _tokens(usage: object, *names: str) -> int:
+    for name in names:
+        value = getattr(usage, name, None)
+        if value:
+            return int(value)
+    return 0
+
+
+def record_usage(
+    route: str,
+    *,
+    tenant_id: str | None = None,
+    model: str | None = None,
+    usage: object = None,
+    upstream_latency_ms: float | None = None,
+    ttft_ms: float | None = None,
+    cached: bool = False,
+    status: str = "ok",
+) -> None:
+    """Queue a usage record built from an Anthropic or OpenAI ``usage`` object."""
+    usage_recorder.record(
+        UsageRecord(
+            route=route,
+            tenant_id=tenant_id,
+            model=model,
+            input_tokens=_tokens(usage, "input_tokens", "prompt_tokens"),
+            output_tokens=_tokens(usage, "output_tokens", "completion_tokens"),
+            cache_creation_input_tokens=_tokens(usage, "cache_creation_input_tokens"),
+            cache_read_input_tokens=_tokens(usage, "cache_read_input_tokens"),
+            upstream_latency_ms=upstream_latency_ms,
+            ttft_ms=ttft_ms,
+            cached=cached,
+            status=status,
+        )
+    )
+
+
+__all__ = ["UsageRecord", "UsageRecorder", "record_usage", "usage_recorder"]
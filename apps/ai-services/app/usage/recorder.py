@@ -0,0 +1,235 @@
+"""Write-behind buffer for per-request usage records.
+
+Routers call :meth:`UsageRecorder.record`, which only appends to an in-memory
+deque. A background task drains the deque into Supabase with one bulk insert
+per batch, either when ``batch_size`` records are waiting or every
+``flush_interval`` seconds, and once more on shutdown.
+
+The buffer is bounded: when Supabase is slow or down, records that do not fit
+are dropped oldest-first (and counted) rather than slowing requests down.
+
+Only transient failures (transport errors, 5xx) are retried. A 4xx means
+PostgREST rejected the data itself -- e.g. a tenant id that passes the UUID
+check but violates the ``tenants`` foreign key -- and retrying it would block
+every later batch, so row-level rejections are bisected to isolate the bad
+rows and anything else is dropped.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+import httpx
+
+from ..clients.supabase_client import SupabaseClient
+from ..metrics import QUEUE_WAIT
+
+
+@dataclass
+class UsageRecord:
+    route: str
+    tenant_id: str | None = None
+    model: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    upstream_latency_ms: float | None = None
+    ttft_ms: float | None = None
+    cached: bool = False
+    status: str = "ok"
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+
+def _valid_tenant(tenant_id: str | None) -> str | None:
+    # A malformed id would make Postgres reject the whole batch.
+    if not tenant_id:
+        return None
+    try:
+        return str(uuid.UUID(tenant_id))
+    except ValueError:
+        return None
+
+
+# PostgREST statuses for rows the database refused (bad input, FK / unique /
+# check violations, oversized body); worth splitting the batch over
+_ROW_REJECTIONS = {400, 409, 413, 422}
+
+
+def _status(exc: Exception) -> int | None:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code
+    return None
+
+
+def _retryable(exc: Exception) -> bool:
+    status = _status(exc)
+    return status is None or status >= 500
+
+
+class UsageRecorder:
+    """Bounded in-memory usage buffer flushed to Supabase in the background."""
+
+    def __init__(
+        self,
+        *,
+        table: str,
+        enabled: bool,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+    ) -> None:
+        self.table = table
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self.rejected = 0
+        # (enqueue time, record) pairs; the timestamp feeds the queue-wait histogram
+        self._buffer: deque[tuple[float, UsageRecord]] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def record(self, record: UsageRecord) -> None:
+        """Queue ``record`` for the next flush. Never blocks or raises."""
+        if not self.enabled:
+            return
+        record.tenant_id = _valid_tenant(record.tenant_id)
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append((time.monotonic(), record))
+        self.recorded += 1
+        if self._wakeup is not None and len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the background task after a final flush.
+
+        The loop is asked to exit rather than cancelled, so a flush already
+        in progress finishes first. Whatever is still buffered when
+        ``timeout`` runs out is counted as dropped.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        self._task = None
+        self.dropped += len(self._buffer)
+        self._buffer.clear()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._stopping:
+                return
+
+    async def flush(self) -> int:
+        """Write buffered records in ``batch_size`` chunks; return rows written.
+
+        On a transient failure the unwritten records go back to the front of
+        the buffer (space permitting) and the flush stops until next time;
+        the same happens if the flush is cancelled mid-insert. Rejected rows
+        are dropped.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                done, unwritten = await self._write(batch)
+                written += done
+                if unwritten:
+                    self._requeue(unwritten)
+                    break
+        return written
+
+    async def _write(
+        self, batch: list[tuple[float, UsageRecord]]
+    ) -> tuple[int, list[tuple[float, UsageRecord]]]:
+        """Insert ``batch``, bisecting on row-level rejections.
+
+        Returns the rows written and, after a transient failure, the rows
+        not yet attempted (in order).
+        """
+        written = 0
+        # Stack of chunks still to insert; the last one is next.
+        chunks = [batch]
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                await SupabaseClient().insert_many(
+                    self.table, [asdict(r) for _, r in chunk]
+                )
+            except asyncio.CancelledError:
+                self._requeue([item for c in [*chunks, chunk][::-1] for item in c])
+                raise
+            except Exception as exc:
+                if _retryable(exc):
+                    self.failed_batches += 1
+                    return written, [item for c in [*chunks, chunk][::-1] for item in c]
+                if _status(exc) in _ROW_REJECTIONS and len(chunk) > 1:
+                    mid = len(chunk) // 2
+                    chunks += [chunk[mid:], chunk[:mid]]
+                else:
+                    self.rejected += len(chunk)
+                    self.dropped += len(chunk)
+                continue
+            now = time.monotonic()
+            for queued_at, _ in chunk:
+                QUEUE_WAIT.labels("usage").observe(now - queued_at)
+            written += len(chunk)
+            self.flushed += len(chunk)
+        return written, []
+
+    def _requeue(self, items: list[tuple[float, UsageRecord]]) -> None:
+        room = max(0, self.max_buffer - len(self._buffer))
+        self.dropped += max(0, len(items) - room)
+        self._buffer.extendleft(reversed(items[:room]))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": self.pending,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "failed_batches": self.failed_batches,
+        }
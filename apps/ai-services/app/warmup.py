@@ -0,0 +1,66 @@
+"""Per-worker warm-up and readiness.
+
+Provider SDKs are imported lazily, so a fresh worker would otherwise pay the
+import and client set-up cost inside its first requests. Right after start-up
+each worker does that work in a thread; ``/ready`` reports 503 until it is
+finished so load balancers only route to warm workers. ``/health`` stays a
+pure liveness check.
+"""
+
+import asyncio
+import importlib
+import time
+
+from .analyzers import score_sentiment
+from .cache import embed_text
+from .clients import get_anthropic_client, get_openai_client, get_sync_anthropic_client
+from .config import settings
+
+# Imported by the prefork parent (app.serve) so every worker shares them.
+PRELOAD_MODULES = ("anthropic", "openai", "sse_starlette.sse")
+
+
+def preload() -> None:
+    """Import the heavy optional SDKs now instead of on first use."""
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+
+def _warm_up() -> None:
+    preload()
+    if settings.anthropic_api_key:
+        get_anthropic_client()
+        get_sync_anthropic_client()
+    if settings.openai_api_key:
+        get_openai_client()
+    score_sentiment("warm up the local analysis path")
+    embed_text("warm up the semantic cache", settings.semantic_cache_dimensions)
+
+
+class WarmUp:
+    """Tracks whether this worker has finished warming up."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.duration_ms: float | None = None
+        self.error: str | None = None
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(_warm_up)
+        except Exception as exc:
+            # A failed warm-up only means the first requests are slower.
+            self.error = str(exc)
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.ready = True
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_ms": self.duration_ms,
+            "warmup_error": self.error,
+        }
+
+
+warm_up = WarmUp()
@@ -0,0 +1,174 @@
+"""Label-match-vs-latency benchmark for the local sentiment fast path.
+
+Runs the local scorer over a labelled sample of social comments, then sweeps
+the confidence threshold used by ``engine="auto"`` and reports, for each
+threshold, how many requests stay local (for sentiment and keywords), how
+often the local sentiment label matches the sample's label, and the
+resulting expected latency per request.
+
+The bundled ``data/sentiment_samples.jsonl`` was written while the lexicon
+was tuned, so its label match is a regression check, not an accuracy
+estimate (the report marks it ``held_out: false``). For an accuracy figure,
+pass ``--samples`` a labelled JSONL set (``{"text", "label"}`` per line) the
+lexicon has never seen.
+
+LLM latency and labels are either measured (``--llm``, needs
+``AI_ANTHROPIC_API_KEY``) or taken from ``--llm-latency-ms`` with the LLM
+assumed to be correct, which gives an upper bound on the label-match cost.
+
+Usage (from ``apps/ai-services``)::
+
+    python -m benchmarks.analyze_local
+    python -m benchmarks.analyze_local --samples held_out.jsonl --llm --output results/analyze_local.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from app.analyzers import extract_keywords, keyword_confidence, score_sentiment
+
+SAMPLES_PATH = Path(__file__).parent / "data" / "sentiment_samples.jsonl"
+THRESHOLDS = [0.0, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def load_samples(path: Path = SAMPLES_PATH) -> list[dict]:
+    with path.open(encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def time_local(samples: list[dict], repeats: int) -> tuple[list[dict], list[float], dict]:
+    """Score every sample ``repeats`` times.
+
+    Returns sentiment predictions, keyword confidences and latency stats (µs).
+    """
+    predictions: list[dict] = []
+    timings: list[float] = []
+    for sample in samples:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = score_sentiment(sample["text"])
+            timings.append((time.perf_counter() - start) * 1e6)
+        predictions.append(result)
+
+    keyword_timings: list[float] = []
+    keyword_confidences: list[float] = []
+    for sample in samples:
+        start = time.perf_counter()
+        keywords = extract_keywords(sample["text"])
+        keyword_timings.append((time.perf_counter() - start) * 1e6)
+        keyword_confidences.append(keyword_confidence(sample["text"], keywords))
+
+    return predictions, keyword_confidences, {
+        "sentiment_p50_us": round(_percentile(timings, 50), 2),
+        "sentiment_p99_us": round(_percentile(timings, 99), 2),
+        "keywords_p50_us": round(_percentile(keyword_timings, 50), 2),
+        "keywords_p99_us": round(_percentile(keyword_timings, 99), 2),
+    }
+
+
+async def time_llm(samples: list[dict]) -> tuple[list[str], list[float]]:
+    """Label every sample through the real ``/api/ai/analyze/`` LLM path."""
+    from app.routers.analyze import AnalyzeRequest, analyze_text
+
+    labels: list[str] = []
+    timings: list[float] = []
+    for sample in samples:
+        start = time.perf_counter()
+        response = await analyze_text(
+            AnalyzeRequest(text=sample["text"], analyses=["sentiment"], engine="llm")
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        sentiment = response.results.get("sentiment") or {}
+        labels.append(sentiment.get("label", "unknown"))
+    return labels, timings
+
+
+def sweep(
+    samples: list[dict],
+    predictions: list[dict],
+    keyword_confidences: list[float],
+    local_ms: float,
+    llm_ms: float,
+    llm_labels: list[str] | None,
+) -> list[dict]:
+    rows = []
+    for threshold in THRESHOLDS:
+        local_hits = [
+            i for i, p in enumerate(predictions) if p["confidence"] >= threshold
+        ]
+        correct = 0
+        for i, sample in enumerate(samples):
+            if i in local_hits:
+                correct += predictions[i]["label"] == sample["label"]
+            elif llm_labels is not None:
+                correct += llm_labels[i] == sample["label"]
+            else:
+                correct += 1
+        local_correct = sum(predictions[i]["label"] == samples[i]["label"] for i in local_hits)
+        coverage = len(local_hits) / len(samples)
+        keyword_coverage = sum(c >= threshold for c in keyword_confidences) / len(samples)
+        rows.append({
+            "threshold": threshold,
+            "local_coverage": round(coverage, 3),
+            "keywords_local_coverage": round(keyword_coverage, 3),
+            "local_label_match": round(local_correct / len(local_hits), 3) if local_hits else None,
+            "overall_label_match": round(correct / len(samples), 3),
+            "expected_latency_ms": round(coverage * local_ms + (1 - coverage) * llm_ms, 2),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--samples", type=Path, help="labelled JSONL set held out from lexicon tuning"
+    )
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--llm", action="store_true", help="measure the LLM path too")
+    parser.add_argument("--llm-latency-ms", type=float, default=1500.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples or SAMPLES_PATH)
+    predictions, keyword_confidences, local_stats = time_local(samples, args.repeats)
+
+    llm_labels = None
+    llm_ms = args.llm_latency_ms
+    if args.llm:
+        llm_labels, llm_timings = asyncio.run(time_llm(samples))
+        llm_ms = statistics.median(llm_timings)
+
+    report = {
+        "samples": len(samples),
+        "dataset": str(args.samples or SAMPLES_PATH.relative_to(Path(__file__).parent)),
+        "held_out": args.samples is not None,
+        "local": local_stats,
+        "llm_latency_ms": round(llm_ms, 1),
+        "llm_measured": args.llm,
+        "sweep": sweep(
+            samples,
+            predictions,
+            keyword_confidences,
+            local_stats["sentiment_p50_us"] / 1000,
+            llm_ms,
+            llm_labels,
+        ),
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
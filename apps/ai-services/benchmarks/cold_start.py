@@ -0,0 +1,195 @@
+"""Cold-start benchmark: import time, time to first request and worker memory.
+
+``import`` runs ``import app.main`` in fresh interpreters and reports the
+wall time and which provider SDKs the import pulled in.
+
+``serve`` starts the service the way production would, once per mode:
+
+* ``uvicorn`` -- ``uvicorn app.main:app --workers N`` (workers import the app)
+* ``serve``   -- ``python -m app.serve`` (app preloaded, workers forked)
+
+and measures, from process start, when ``/health`` first answers, when
+``/ready`` first reports warm, and when a chat completion sent as soon as
+``/health`` answers comes back (providers are served by
+:mod:`benchmarks.fakes` with near-zero latency, so this is the service's own
+start-up cost). It also reports the summed PSS of all processes (Linux only),
+which shows how much memory the forked workers share.
+
+Usage (from ``apps/ai-services``)::
+
+    python -m benchmarks.cold_start --workers 4 --output results/cold_start.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+SERVICE_ROOT = Path(__file__).resolve().parent.parent
+SDK_MODULES = ("anthropic", "openai", "numpy")
+
+_IMPORT_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "elapsed = time.perf_counter() - start\n"
+    f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {SDK_MODULES!r} if m in sys.modules]}}))\n"
+)
+
+
+def measure_import(runs: int) -> dict:
+    timings: list[float] = []
+    loaded: list[str] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE],
+            cwd=SERVICE_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"] * 1000)
+        loaded = result["loaded"]
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(timings), 1),
+        "min_ms": round(min(timings), 1),
+        "sdks_loaded": loaded,
+    }
+
+
+def _process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    try:
+        children = Path(f"/proc/{pid}/task/{pid}/children").read_text().split()
+    except OSError:
+        return pids
+    for child in children:
+        pids += _process_tree(int(child))
+    return pids
+
+
+def _pss_mb(pid: int) -> float | None:
+    total = 0
+    for member in _process_tree(pid):
+        try:
+            rollup = Path(f"/proc/{member}/smaps_rollup").read_text()
+        except OSError:
+            return None
+        for line in rollup.splitlines():
+            if line.startswith("Pss:"):
+                total += int(line.split()[1])
+    return round(total / 1024, 1)
+
+
+def _poll(client: httpx.Client, path: str, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(path).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{path} did not answer 200 in time")
+
+
+def measure_serve(mode: str, workers: int, port: int, fake_url: str, timeout: float) -> dict:
+    env = {
+        **os.environ,
+        "AI_ANTHROPIC_API_KEY": "bench",
+        "AI_ANTHROPIC_BASE_URL": fake_url,
+        "AI_OPENAI_API_KEY": "bench",
+        "AI_OPENAI_BASE_URL": f"{fake_url}/v1",
+        "AI_WORKERS": str(workers),
+        "PORT": str(port),
+    }
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    if mode == "uvicorn":
+        command = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ]
+    else:
+        command = [sys.executable, "-m", "app.serve"]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=SERVICE_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = started + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            health = _poll(client, "/health", deadline)
+            resp = client.post(
+                "/api/ai/chat/completions",
+                json={"messages": [{"role": "user", "content": "hello"}], "use_cache": False},
+            )
+            first_request = time.perf_counter()
+            ready = _poll(client, "/ready", deadline)
+            # Let every worker finish warming up before sampling memory.
+            time.sleep(1.0)
+            pss = _pss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        "mode": mode,
+        "workers": workers,
+        "health_ms": round((health - started) * 1000, 1),
+        "first_request_ms": round((first_request - started) * 1000, 1),
+        "first_request_latency_ms": round((first_request - health) * 1000, 1),
+        "first_request_status": resp.status_code,
+        "ready_ms": round((ready - started) * 1000, 1),
+        "pss_mb": pss,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--import-runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", default="uvicorn,serve")
+    parser.add_argument("--port", type=int, default=5198)
+    parser.add_argument("--fake-port", type=int, default=5199)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fakes = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.fakes", "--port", str(args.fake_port),
+            "--ttft-ms", "0", "--tokens-per-second", "100000", "--jitter", "0",
+        ],
+        cwd=SERVICE_ROOT,
+    )
+    try:
+        with httpx.Client() as client:
+            _poll(client, f"{fake_url}/rest/v1/health_probe", time.perf_counter() + 30)
+        report = {
+            "import": measure_import(args.import_runs),
+            "serve": [
+                measure_serve(mode, args.workers, args.port, fake_url, args.timeout)
+                for mode in args.modes.split(",")
+            ],
+        }
+    finally:
+        fakes.terminate()
+        fakes.wait(timeout=15)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Local stand-ins for Anthropic, OpenAI and Supabase (PostgREST).
+
+One server exposes all three APIs so the service can be load-tested without
+provider accounts:
+
+* ``POST /v1/messages``   Anthropic Messages API, plain and ``stream=true`` SSE
+* ``POST /v1/embeddings`` OpenAI embeddings (``float`` and ``base64`` encoding)
+* ``/rest/v1/{table}``    PostgREST ``GET`` / ``POST`` / ``PATCH``
+
+Model replies take ``ttft`` plus one output token per ``1 / tokens_per_second``
+seconds (streamed as individual deltas); embeddings and PostgREST calls take
+their own fixed latency. Every latency gets ``±jitter`` relative noise.
+``error_rate`` fails that fraction of requests up front (Anthropic ``529
+overloaded``, OpenAI ``500``, PostgREST ``503``) and ``stream_abort_rate``
+ends that fraction of streams with an ``error`` event mid-way. Note that the
+provider SDKs retry ``529``/``5xx`` responses themselves, so injected errors
+show up as extra latency before they show up as failed requests.
+
+Point the service at it with::
+
+    AI_ANTHROPIC_BASE_URL=http://127.0.0.1:5199
+    AI_OPENAI_BASE_URL=http://127.0.0.1:5199/v1
+    AI_SUPABASE_URL=http://127.0.0.1:5199
+
+Usage (from ``apps/ai-services``)::
+
+    python -m benchmarks.fakes --port 5199 --ttft-ms 400 --tokens-per-second 80
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import re
+import struct
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+WORDS = (
+    "campaign engagement pipeline revenue client content audience growth conversion "
+    "forecast keyword ranking budget invoice quarter strategy retention churn reach"
+).split()
+
+_JSON_KEYS_RE = re.compile(r"JSON object with keys: ([\w, ]+)\.")
+
+
+@dataclass
+class FakeConfig:
+    ttft_ms: float = 400.0
+    tokens_per_second: float = 80.0
+    output_tokens: int = 120
+    embed_latency_ms: float = 80.0
+    supabase_latency_ms: float = 15.0
+    supabase_rows: int = 20
+    jitter: float = 0.1
+    error_rate: float = 0.0
+    stream_abort_rate: float = 0.0
+
+
+def _words(count: int) -> list[str]:
+    return [random.choice(WORDS) for _ in range(max(1, count))]
+
+
+def _reply_text(body: dict, tokens: int) -> str:
+    """Plain text, or JSON shaped like what the calling router parses."""
+    system = body.get("system") or ""
+    if isinstance(system, list):
+        system = " ".join(block.get("text", "") for block in system)
+    prompt = " ".join(
+        m["content"] if isinstance(m["content"], str) else json.dumps(m["content"])
+        for m in body.get("messages", [])
+    )
+
+    keys = _JSON_KEYS_RE.search(prompt)
+    if keys:
+        names = [k.strip() for k in keys.group(1).split(",")]
+        per_key = max(1, tokens // len(names))
+        return json.dumps({name: " ".join(_words(per_key)) for name in names})
+    if "JSON array" in system:
+        return json.dumps([
+            {
+                "title": " ".join(_words(3)),
+                "summary": " ".join(_words(max(1, tokens // 4))),
+                "type": "general",
+                "details": {},
+            }
+            for _ in range(4)
+        ])
+    return " ".join(_words(tokens))
+
+
+_NUMERIC_SUFFIXES = ("count", "value", "amount", "volume", "rank", "probability", "difficulty")
+
+
+def _column_value(column: str, now: str) -> object:
+    if column == "id":
+        return str(uuid.uuid4())
+    if column.endswith(("_at", "date")):
+        return now
+    if column.endswith(_NUMERIC_SUFFIXES):
+        return random.randint(0, 10_000)
+    return " ".join(_words(6))
+
+
+def _input_tokens(body: dict) -> int:
+    return max(1, len(json.dumps(body)) // 4)
+
+
+class FakeServer:
+    def __init__(self, config: FakeConfig) -> None:
+        self.config = config
+
+    async def _sleep(self, ms: float) -> None:
+        if ms <= 0:
+            return
+        jitter = self.config.jitter
+        await asyncio.sleep(ms / 1000 * random.uniform(1 - jitter, 1 + jitter))
+
+    def _should_fail(self) -> bool:
+        return random.random() < self.config.error_rate
+
+    # -- Anthropic ---------------------------------------------------------
+
+    async def messages(self, request: Request) -> Response:
+        body = await request.json()
+        if self._should_fail():
+            await self._sleep(self.config.ttft_ms / 4)
+            return JSONResponse(
+                {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+                status_code=529,
+            )
+
+        tokens = min(self.config.output_tokens, int(body.get("max_tokens", 4096)))
+        text = _reply_text(body, tokens)
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "fake-model")
+        input_tokens = _input_tokens(body)
+
+        if body.get("stream"):
+            return StreamingResponse(
+                self._message_stream(message_id, model, text, tokens, input_tokens),
+                media_type="text/event-stream",
+            )
+
+        await self._sleep(self.config.ttft_ms + tokens / self.config.tokens_per_second * 1000)
+        return JSONResponse({
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": tokens},
+        })
+
+    async def _message_stream(
+        self, message_id: str, model: str, text: str, tokens: int, input_tokens: int
+    ):
+        def event(name: str, data: dict) -> bytes:
+            return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+
+        yield event("message_start", {
+            "type": "message_start",
+            "message": {
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+            },
+        })
+        await self._sleep(self.config.ttft_ms)
+        yield event("content_block_start", {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        })
+
+        # Split the reply into ``tokens`` roughly equal deltas.
+        size = max(1, -(-len(text) // tokens))
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        abort_at = (
+            random.randrange(len(chunks))
+            if random.random() < self.config.stream_abort_rate
+            else None
+        )
+        for i, chunk in enumerate(chunks):
+            if i == abort_at:
+                yield event("error", {
+                    "type": "error",
+                    "error": {"type": "overloaded_error", "message": "Overloaded"},
+                })
+                return
+            if i:
+                await self._sleep(1000 / self.config.tokens_per_second)
+            yield event("content_block_delta", {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": chunk},
+            })
+
+        yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": tokens},
+        })
+        yield event("message_stop", {"type": "message_stop"})
+
+    # -- OpenAI ------------------------------------------------------------
+
+    async def embeddings(self, request: Request) -> Response:
+        body = await request.json()
+        await self._sleep(self.config.embed_latency_ms)
+        if self._should_fail():
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error"}},
+                status_code=500,
+            )
+
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        dimensions = int(body.get("dimensions") or 1536)
+        data = []
+        for index, _ in enumerate(inputs):
+            vector = [random.uniform(-1, 1) for _ in range(dimensions)]
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(struct.pack(f"<{dimensions}f", *vector)).decode()
+            else:
+                embedding = vector
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        tokens = sum(max(1, len(str(text)) // 4) for text in inputs)
+        return JSONResponse({
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    # -- PostgREST ---------------------------------------------------------
+
+    async def rest(self, request: Request) -> Response:
+        await self._sleep(self.config.supabase_latency_ms)
+        if self._should_fail():
+            return JSONResponse({"message": "Injected failure"}, status_code=503)
+
+        if request.method == "GET":
+            select = request.query_params.get("select", "*")
+            columns = ["id", "name", "created_at"] if select == "*" else select.split(",")
+            limit = int(request.query_params.get("limit", self.config.supabase_rows))
+            now = datetime.now(timezone.utc).isoformat()
+            rows = [
+                {column: _column_value(column, now) for column in columns}
+                for _ in range(min(limit, self.config.supabase_rows))
+            ]
+            return JSONResponse(rows)
+
+        payload = await request.json()
+        if "return=minimal" in request.headers.get("prefer", ""):
+            return Response(status_code=201 if request.method == "POST" else 204)
+        rows = payload if isinstance(payload, list) else [payload]
+        return JSONResponse(rows, status_code=201 if request.method == "POST" else 200)
+
+
+def create_app(config: FakeConfig) -> Starlette:
+    server = FakeServer(config)
+    return Starlette(routes=[
+        Route("/v1/messages", server.messages, methods=["POST"]),
+        Route("/v1/embeddings", server.embeddings, methods=["POST"]),
+        Route("/rest/v1/{table}", server.rest, methods=["GET", "POST", "PATCH"]),
+    ])
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeConfig()
+    for name, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(value), default=value, dest=name
+        )
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(**{name: getattr(args, name) for name in vars(FakeConfig())})
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5199)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
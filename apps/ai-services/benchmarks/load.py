@@ -0,0 +1,457 @@
+"""Load driver for the AI service routers.
+
+Runs each selected route at each concurrency level for a fixed duration and
+reports throughput, latency percentiles, time to first token (streaming
+routes) and event-loop lag. Server-side lag comes from the service's
+``ccd_ai_event_loop_lag_seconds`` histogram (scraped from ``/metrics`` before
+and after every run); client-side lag is measured in this process so an
+overloaded driver can be told apart from an overloaded service.
+
+With ``--spawn`` the driver starts the provider stand-ins from
+:mod:`benchmarks.fakes` and the service itself through ``app.serve``
+(``--workers`` preforked workers, as in production) wired to them; otherwise
+it targets ``--url``. Results are written as JSON to ``--output`` (default
+``benchmarks/results/``, which git ignores); ``--baseline`` prints the change
+against an earlier result file.
+
+Usage (from ``apps/ai-services``)::
+
+    python -m benchmarks.load --spawn --routes chat,stream --concurrency 1,16,64
+    python -m benchmarks.load --spawn --baseline results/load-main.json
+    python -m benchmarks.load --url http://localhost:5100 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+from .fakes import FakeConfig, add_config_arguments, config_from_args
+
+SERVICE_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+TENANT_ID = "00000000-0000-4000-8000-000000000001"
+LAG_METRIC = "ccd_ai_event_loop_lag_seconds"
+
+_PROMPT = (
+    "Draft a short update for the client about last month's campaign results, "
+    "covering reach, engagement and the plan for next quarter."
+)
+
+
+def _unique(text: str) -> str:
+    # Keeps every request a semantic-cache miss even when the cache is enabled.
+    return f"{text} [{uuid.uuid4().hex[:8]}]"
+
+
+@dataclass
+class Scenario:
+    path: str
+    payload: object
+    stream: bool = False
+    # SSE event whose first arrival counts as time to first token
+    first_event: str = "text"
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "chat": Scenario(
+        "/api/ai/chat/completions",
+        lambda: {
+            "messages": [{"role": "user", "content": _unique(_PROMPT)}],
+            "module_context": "content",
+            "tenant_id": TENANT_ID,
+        },
+    ),
+    "stream": Scenario(
+        "/api/ai/chat/stream",
+        lambda: {
+            "messages": [{"role": "user", "content": _unique(_PROMPT)}],
+            "module_context": "content",
+            "tenant_id": TENANT_ID,
+        },
+        stream=True,
+    ),
+    "generate": Scenario(
+        "/api/ai/generate/",
+        lambda: {"type": "email_draft", "prompt": _unique(_PROMPT), "tenant_id": TENANT_ID},
+    ),
+    "analyze": Scenario(
+        "/api/ai/analyze/",
+        lambda: {
+            "text": _unique("Loved the new dashboard, but the export keeps timing out."),
+            "analyses": ["sentiment", "keywords", "summary"],
+            "tenant_id": TENANT_ID,
+        },
+    ),
+    "insights": Scenario(
+        "/api/ai/insights/generate",
+        lambda: {"tenant_id": TENANT_ID, "category": "crm"},
+    ),
+    "insights_bulk": Scenario(
+        "/api/ai/insights/generate/bulk",
+        lambda: {"tenant_id": TENANT_ID},
+        stream=True,
+        first_event="insights",
+    ),
+    "embed": Scenario(
+        "/api/ai/embed",
+        lambda: {"texts": [_unique(_PROMPT) for _ in range(8)], "tenant_id": TENANT_ID},
+    ),
+    "automation": Scenario(
+        "/api/ai/automation/run",
+        lambda: {
+            "automation_type": "content_suggestions",
+            "automation_config": {"channels": ["blog", "linkedin"]},
+            "tenant_id": TENANT_ID,
+        },
+    ),
+}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _summary(values: list[float]) -> dict | None:
+    if not values:
+        return None
+    return {
+        "p50": round(_percentile(values, 50), 2),
+        "p95": round(_percentile(values, 95), 2),
+        "p99": round(_percentile(values, 99), 2),
+        "mean": round(sum(values) / len(values), 2),
+        "max": round(max(values), 2),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Event-loop lag
+# ---------------------------------------------------------------------------
+
+async def _scrape_lag(client: httpx.AsyncClient) -> dict[float, float] | None:
+    """Cumulative bucket counts (plus ``sum`` under key -1) of the lag histogram."""
+    try:
+        resp = await client.get("/metrics")
+        resp.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    buckets: dict[float, float] = {}
+    for family in text_string_to_metric_families(resp.text):
+        if family.name != LAG_METRIC:
+            continue
+        for sample in family.samples:
+            if sample.name.endswith("_bucket"):
+                le = float(sample.labels["le"])
+                buckets[le] = buckets.get(le, 0.0) + sample.value
+            elif sample.name.endswith("_sum"):
+                buckets[-1.0] = buckets.get(-1.0, 0.0) + sample.value
+    return buckets or None
+
+
+def _lag_delta(before: dict | None, after: dict | None) -> dict | None:
+    """Mean and bucket-resolution p99 (ms) of the samples taken during a run."""
+    if not before or not after:
+        return None
+    delta = {le: after.get(le, 0.0) - before.get(le, 0.0) for le in after}
+    total = delta.get(float("inf"), 0.0)
+    if total <= 0:
+        return None
+    p99 = next(le for le in sorted(k for k in delta if k >= 0) if delta[le] >= 0.99 * total)
+    return {
+        "samples": int(total),
+        "mean_ms": round(delta.get(-1.0, 0.0) / total * 1000, 3),
+        "p99_ms": None if p99 == float("inf") else round(p99 * 1000, 3),
+    }
+
+
+@dataclass
+class _LagProbe:
+    interval: float = 0.05
+    samples: list[float] = field(default_factory=list)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - due) * 1000)
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+async def _call(client: httpx.AsyncClient, scenario: Scenario) -> tuple[bool, float | None]:
+    """One request; returns (ok, ttft_seconds)."""
+    if not scenario.stream:
+        resp = await client.post(scenario.path, json=scenario.payload())
+        return resp.status_code < 400, None
+
+    started = time.perf_counter()
+    ttft = None
+    ok = True
+    async with client.stream("POST", scenario.path, json=scenario.payload()) as resp:
+        if resp.status_code >= 400:
+            await resp.aread()
+            return False, None
+        async for line in resp.aiter_lines():
+            if line.startswith("event:"):
+                name = line.partition(":")[2].strip()
+                if name == scenario.first_event and ttft is None:
+                    ttft = time.perf_counter() - started
+                elif name == "error":
+                    ok = False
+    return ok, ttft
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    route: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict:
+    scenario = SCENARIOS[route]
+    latencies: list[float] = []
+    ttfts: list[float] = []
+    errors = 0
+    # Requests started during warm-up are sent but not counted.
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                ok, ttft = await _call(client, scenario)
+            except httpx.HTTPError:
+                ok, ttft = False, None
+            if start < measure_from:
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            if ttft is not None:
+                ttfts.append(ttft * 1000)
+            errors += not ok
+
+    probe = _LagProbe()
+    probe_task = asyncio.create_task(probe.run())
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    await asyncio.sleep(warmup)
+    lag_before = await _scrape_lag(client)
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - measure_from
+    lag_after = await _scrape_lag(client)
+    probe_task.cancel()
+
+    return {
+        "route": route,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _summary(latencies),
+        "ttft_ms": _summary(ttfts),
+        "server_loop_lag": _lag_delta(lag_before, lag_after),
+        "client_loop_lag_ms": _summary(probe.samples),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Spawned environment
+# ---------------------------------------------------------------------------
+
+def _wait_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+@contextmanager
+def spawned_service(
+    fake_config: FakeConfig, *, port: int, fake_port: int, workers: int
+) -> Iterator[str]:
+    """Start the fakes and the service wired to them; yield the service URL."""
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    fake_args = [
+        arg
+        for name, value in vars(fake_config).items()
+        for arg in (f"--{name.replace('_', '-')}", str(value))
+    ]
+    processes: list[subprocess.Popen] = []
+    with tempfile.TemporaryDirectory(prefix="ccd-bench-metrics-") as metrics_dir:
+        env = {
+            **os.environ,
+            "AI_ANTHROPIC_API_KEY": "bench",
+            "AI_ANTHROPIC_BASE_URL": fake_url,
+            "AI_OPENAI_API_KEY": "bench",
+            "AI_OPENAI_BASE_URL": f"{fake_url}/v1",
+            "AI_SUPABASE_URL": fake_url,
+            "AI_SUPABASE_SERVICE_ROLE_KEY": "bench",
+            "PROMETHEUS_MULTIPROC_DIR": metrics_dir,
+            "AI_HOST": "127.0.0.1",
+            "AI_WORKERS": str(workers),
+            "PORT": str(port),
+        }
+        try:
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.fakes", "--port", str(fake_port), *fake_args],
+                cwd=SERVICE_ROOT,
+            ))
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "app.serve"],
+                cwd=SERVICE_ROOT,
+                env=env,
+            ))
+            _wait_healthy(f"{fake_url}/rest/v1/health_probe")
+            _wait_healthy(f"http://127.0.0.1:{port}/health")
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+            for process in processes:
+                process.wait(timeout=15)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _cell(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _print_table(results: list[dict]) -> None:
+    header = (
+        f"{'route':<15}{'conc':>5}{'reqs':>7}{'err':>5}{'rps':>9}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'ttft50':>9}{'lag p99':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        latency = row["latency_ms"] or {}
+        ttft = row["ttft_ms"] or {}
+        lag = row["server_loop_lag"] or {}
+        print(
+            f"{row['route']:<15}{row['concurrency']:>5}{row['requests']:>7}{row['errors']:>5}"
+            f"{row['rps']:>9.1f}{_cell(latency.get('p50')):>9}{_cell(latency.get('p95')):>9}"
+            f"{_cell(latency.get('p99')):>9}{_cell(ttft.get('p50')):>9}"
+            f"{_cell(lag.get('p99_ms')):>9}"
+        )
+
+
+def compare(results: list[dict], baseline: dict) -> list[dict]:
+    """Relative change of rps and latency percentiles per (route, concurrency)."""
+    previous = {(r["route"], r["concurrency"]): r for r in baseline["results"]}
+    rows = []
+    for row in results:
+        before = previous.get((row["route"], row["concurrency"]))
+        if before is None or not before["latency_ms"] or not row["latency_ms"]:
+            continue
+        change = {"route": row["route"], "concurrency": row["concurrency"]}
+        if before["rps"]:
+            change["rps_pct"] = round((row["rps"] / before["rps"] - 1) * 100, 1)
+        for pct in ("p50", "p95", "p99"):
+            if before["latency_ms"][pct]:
+                change[f"{pct}_pct"] = round(
+                    (row["latency_ms"][pct] / before["latency_ms"][pct] - 1) * 100, 1
+                )
+        rows.append(change)
+    return rows
+
+
+async def run(args: argparse.Namespace, url: str) -> list[dict]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    results = []
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        for route in args.routes:
+            for concurrency in args.concurrency:
+                row = await run_scenario(client, route, concurrency, args.duration, args.warmup)
+                results.append(row)
+                print(
+                    f"{route} x{concurrency}: {row['rps']} rps, "
+                    f"p95 {(row['latency_ms'] or {}).get('p95')} ms, {row['errors']} errors",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5100")
+    parser.add_argument("--routes", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds per run")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, help="earlier result file to compare against")
+    spawn = parser.add_argument_group("spawned environment")
+    spawn.add_argument("--spawn", action="store_true", help="start fakes + service locally")
+    spawn.add_argument("--port", type=int, default=5198)
+    spawn.add_argument("--fake-port", type=int, default=5199)
+    spawn.add_argument("--workers", type=int, default=1)
+    add_config_arguments(spawn)
+    args = parser.parse_args()
+
+    args.routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    unknown = [r for r in args.routes if r not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "duration_s": args.duration,
+        "target": "spawned" if args.spawn else args.url,
+    }
+    if args.spawn:
+        fake_config = config_from_args(args)
+        meta.update(workers=args.workers, fakes=vars(fake_config))
+        with spawned_service(
+            fake_config, port=args.port, fake_port=args.fake_port, workers=args.workers
+        ) as url:
+            results = asyncio.run(run(args, url))
+    else:
+        results = asyncio.run(run(args, args.url))
+
+    report = {"meta": meta, "results": results}
+    if args.baseline:
+        report["baseline"] = str(args.baseline)
+        report["change"] = compare(results, json.loads(args.baseline.read_text()))
+
+    _print_table(results)
+    if report.get("change"):
+        print("\nchange vs baseline (%):")
+        for row in report["change"]:
+            print("  " + ", ".join(f"{k}={v}" for k, v in row.items()))
+
+    output = args.output or RESULTS_DIR / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nresults written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
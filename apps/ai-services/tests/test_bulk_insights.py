@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import insights
+from app.routers.insights import BulkInsightsRequest, InsightsResponse
+
+TENANT = "00000000-0000-4000-8000-000000000001"
+DELAYS = {"crm": 0.06, "finance": 0.0, "seo": 0.03}
+
+
+@pytest.fixture
+def fake_insights(monkeypatch):
+    async def fetch(category, tenant_id, http=None):
+        return f"{category} data"
+
+    async def generate(category, tenant_id, data_context, additional_context, *, route):
+        await asyncio.sleep(DELAYS.get(category, 0))
+        if category == "social":
+            raise HTTPException(502, "upstream failed")
+        return InsightsResponse(insights=[], category=category, model="test-model")
+
+    monkeypatch.setattr(insights, "_fetch_category_data", fetch)
+    monkeypatch.setattr(insights, "_generate_category_insights", generate)
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.replace("\r\n", "\n").split("\n\n"):
+        lines = dict(
+            line.split(": ", 1) for line in block.splitlines() if line.startswith(("event", "data"))
+        )
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _post(categories: list[str]):
+    client = TestClient(app)
+    return client.post(
+        "/api/ai/insights/generate/bulk",
+        json={"tenant_id": TENANT, "categories": categories},
+    )
+
+
+def test_categories_stream_as_they_finish(fake_insights):
+    response = _post(["crm", "finance", "seo"])
+    events = _events(response.text)
+    assert [data.get("category") for _, data in events[:-1]] == ["finance", "seo", "crm"]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["completed"] == 3
+
+
+def test_failed_category_becomes_error_event(fake_insights):
+    events = _events(_post(["finance", "social"]).text)
+    assert ("error", {"category": "social", "detail": "upstream failed"}) in events
+    assert events[-1][1]["failed"] == 1
+
+
+def test_unknown_category_is_rejected():
+    assert _post(["crm", "payroll"]).status_code == 422
+
+
+def test_repeated_categories_are_deduplicated():
+    body = BulkInsightsRequest(tenant_id=TENANT, categories=["crm"] * 6)
+    assert body.categories == ["crm"]
+
+
+async def test_disconnect_cancels_tasks_before_client_closes(monkeypatch):
+    order = []
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            order.append("client closed")
+
+    async def fetch(category, tenant_id, http=None):
+        return ""
+
+    async def generate(category, tenant_id, data_context, additional_context, *, route):
+        if category == "finance":
+            return InsightsResponse(insights=[], category=category, model="test-model")
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            order.append(f"{category} cancelled")
+            raise
+
+    monkeypatch.setattr(insights.httpx, "AsyncClient", FakeClient)
+    monkeypatch.setattr(insights, "_fetch_category_data", fetch)
+    monkeypatch.setattr(insights, "_generate_category_insights", generate)
+
+    response = await insights.generate_insights_bulk(
+        BulkInsightsRequest(tenant_id=TENANT, categories=["crm", "finance", "seo"])
+    )
+    events = response.body_iterator
+    first = await anext(events)
+    assert first["event"] == "insights"
+    await events.aclose()
+
+    assert sorted(order[:2]) == ["crm cancelled", "seo cancelled"]
+    assert order[2:] == ["client closed"]
@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analyzers import corpus as corpus_module
+from app.analyzers import extract_keywords, run_local_analyses
+from app.analyzers.corpus import CorpusRegistry
+from app.config import settings
+from app.main import app
+
+LONG_TEXT = (
+    "Our Black Friday campaign drove record engagement on Instagram and LinkedIn, "
+    "with conversion up across every paid channel."
+)
+
+
+@pytest.mark.parametrize("text", ["great product", "lol", "asdf qwrt zxcv !!!", "loooool xD xD"])
+def test_short_or_noisy_keywords_fall_back(text):
+    results = run_local_analyses(text, ["keywords"], min_confidence=0.6)
+    assert "keywords" not in results
+
+
+def test_confident_keywords_stay_local():
+    results = run_local_analyses(LONG_TEXT, ["keywords"], min_confidence=0.6)
+    assert results["keywords"]
+
+
+def test_without_threshold_keywords_are_always_returned():
+    assert run_local_analyses("great product", ["keywords"])["keywords"]
+
+
+class FakeSupabase:
+    async def query(self, table, **kwargs):
+        return [{"content": "spring sale", "title": "launch", "body": "new plans"}]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(corpus_module, "SupabaseClient", FakeSupabase)
+    return CorpusRegistry(ttl_seconds=60, max_tenants=2)
+
+
+async def test_registry_ignores_non_uuid_tenants(registry):
+    assert registry.get("not-a-tenant") is None
+    assert registry._builds == {}
+
+
+async def test_registry_caps_concurrent_builds(registry):
+    for _ in range(corpus_module.MAX_CONCURRENT_BUILDS + 3):
+        registry.get(str(uuid.uuid4()))
+    assert len(registry._builds) == corpus_module.MAX_CONCURRENT_BUILDS
+    await asyncio.gather(*registry._builds.values())
+
+
+async def test_registry_evicts_least_recently_used(registry):
+    tenants = [str(uuid.uuid4()) for _ in range(3)]
+    await registry.build(tenants[0])
+    await registry.build(tenants[1])
+    registry.get(tenants[0])
+    await registry.build(tenants[2])
+    assert list(registry._indexes) == [tenants[0], tenants[2]]
+
+
+@pytest.mark.parametrize(
+    "text", ["Is this any good?", "I thought it would be good", "not good", "Love it"]
+)
+def test_single_lexicon_hit_falls_back(text):
+    results = run_local_analyses(
+        text, ["sentiment"], min_confidence=settings.local_analysis_min_confidence
+    )
+    assert "sentiment" not in results
+
+
+def test_clear_sentiment_stays_local():
+    results = run_local_analyses(
+        "This is great, love the new design",
+        ["sentiment"],
+        min_confidence=settings.local_analysis_min_confidence,
+    )
+    assert results["sentiment"]["label"] == "positive"
+
+
+def test_repeated_phrases_are_counted():
+    keywords = extract_keywords("spring sale. spring sale. launch party")
+    assert keywords[0]["keyword"] == "spring sale"
+
+
+def test_local_engine_rejects_oversized_text():
+    client = TestClient(app)
+    response = client.post(
+        "/api/ai/analyze/",
+        json={
+            "text": "word " * settings.local_analysis_hard_max_chars,
+            "analyses": ["keywords"],
+            "engine": "local",
+        },
+    )
+    assert response.status_code == 413
@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.metrics import MetricsMiddleware
+
+
+def _middleware() -> MetricsMiddleware:
+    stack = app.middleware_stack or app.build_middleware_stack()
+    while not isinstance(stack, MetricsMiddleware):
+        stack = stack.app
+    return stack
+
+
+def _latency_routes() -> set[str]:
+    return {
+        sample.labels["route"]
+        for metric in REGISTRY.collect()
+        if metric.name == "ccd_ai_request_duration_seconds"
+        for sample in metric.samples
+    }
+
+
+def _scope(method: str, path: str) -> dict:
+    return {"type": "http", "method": method, "path": path}
+
+
+def test_parameterised_paths_are_labelled_by_template():
+    client = TestClient(app)
+    for i in range(5):
+        client.get(f"/api/ai/profiles/{i:032x}")
+
+    middleware = _middleware()
+    assert middleware._label(_scope("GET", f"/api/ai/profiles/{9:032x}")) == (
+        "/api/ai/profiles/{profile_id}"
+    )
+    assert not any("/api/ai/profiles/0" in key[1] for key in middleware._static)
+    assert len(middleware._templated) == 1
+
+    routes = _latency_routes()
+    assert "/api/ai/profiles/{profile_id}" in routes
+    assert not any(route.startswith("/api/ai/profiles/0") for route in routes)
+
+
+def test_static_and_unknown_paths():
+    client = TestClient(app)
+    client.get("/health")
+    client.get("/no/such/route")
+
+    middleware = _middleware()
+    assert middleware._label(_scope("GET", "/health")) == "/health"
+    assert middleware._label(_scope("GET", "/no/such/route")) == "unmatched"
+    assert ("GET", "/no/such/route") not in middleware._static
@@ -0,0 +1,60 @@
+import os
+import time
+
+import pytest
+
+from app.config import settings
+from app.profiling import ProfilingMiddleware
+
+pytest.importorskip("pyinstrument")
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _request(middleware: ProfilingMiddleware) -> dict:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/api/ai/chat/completions", "headers": []}
+    await middleware(scope, receive, send)
+    return dict(sent[0]["headers"])
+
+
+@pytest.fixture
+def profiling_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "profiling_max_files", 3)
+    monkeypatch.setattr(settings, "profiling_max_age_seconds", 3600.0)
+    return tmp_path
+
+
+async def test_profile_is_written(profiling_dir):
+    headers = await _request(ProfilingMiddleware(_app))
+    profile_id = headers[b"x-ccd-profile-id"].decode()
+    assert (profiling_dir / f"{profile_id}.speedscope.json").exists()
+
+
+async def test_keeps_newest_profiles_only(profiling_dir):
+    middleware = ProfilingMiddleware(_app)
+    for _ in range(5):
+        await _request(middleware)
+    assert len(list(profiling_dir.glob("*.speedscope.json"))) == 3
+
+
+async def test_expired_profiles_are_deleted(profiling_dir):
+    old = profiling_dir / f"{'0' * 32}.speedscope.json"
+    old.write_text("{}")
+    stale = time.time() - 2 * settings.profiling_max_age_seconds
+    os.utime(old, (stale, stale))
+
+    await _request(ProfilingMiddleware(_app))
+    assert not old.exists()
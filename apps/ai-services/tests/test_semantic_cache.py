@@ -0,0 +1,142 @@
+import uuid
+
+import pytest
+
+from app.cache import SemanticCache, guard_terms
+from app.config import settings
+
+TENANT = "00000000-0000-4000-8000-000000000001"
+
+
+@pytest.fixture
+def cache() -> SemanticCache:
+    return SemanticCache(
+        routes=["chat", "generate"],
+        threshold=settings.semantic_cache_threshold,
+        ttl_seconds=60,
+        max_entries=16,
+        max_tenants=2,
+        dimensions=settings.semantic_cache_dimensions,
+    )
+
+
+def _hit(cache: SemanticCache, stored: str, asked: str, namespace: str = "ns"):
+    cache.store("chat", TENANT, namespace, stored, {"content": stored})
+    return cache.lookup("chat", TENANT, namespace, asked)
+
+
+@pytest.mark.parametrize(
+    "stored, asked",
+    [
+        (
+            "Write a caption for our Black Friday sale",
+            "write a caption for our Black Friday sale!",
+        ),
+        (
+            "Can you write a caption for our Black Friday sale?",
+            "write a caption for our Black Friday sale please",
+        ),
+        (
+            "Summarize last month's campaign results for the client.",
+            "Please summarize last month's campaign results for the client",
+        ),
+    ],
+)
+def test_repeated_prompt_hits(cache, stored, asked):
+    hit = _hit(cache, stored, asked)
+    assert hit is not None
+    assert hit.value["content"] == stored
+
+
+@pytest.mark.parametrize(
+    "stored, asked",
+    [
+        (
+            "Draft a reminder email to the client about invoice 1043, which is overdue",
+            "Draft a reminder email to the client about invoice 1044, which is overdue",
+        ),
+        (
+            "Write a post announcing 20% off all plans this week",
+            "Write a post announcing 50% off all plans this week",
+        ),
+        (
+            "Write a post announcing our new pricing and mention the discount",
+            "Do not write a post announcing our new pricing and mention the discount",
+        ),
+        (
+            "Write an email to the client and mention the discount",
+            "Write an email to the client and don't mention the discount",
+        ),
+        (
+            "Summarize the campaign results for the client in three bullet points",
+            "Summarize the campaign results for the client in five bullet points",
+        ),
+        (
+            "Write a caption for our Black Friday sale",
+            "Write a caption for our Cyber Monday sale",
+        ),
+        (
+            "Write a thank-you note to Acme for renewing their contract",
+            "Write a thank-you note to Globex for renewing their contract",
+        ),
+    ],
+)
+def test_near_miss_does_not_hit(cache, stored, asked):
+    assert _hit(cache, stored, asked) is None
+
+
+def test_guard_terms_ignore_sentence_start_capitals():
+    assert guard_terms("Write a caption. Keep it short") == guard_terms(
+        "write a caption. keep it short"
+    )
+
+
+def test_namespace_must_match(cache):
+    cache.store("chat", TENANT, "ns-a", "Write a caption for our sale", {"content": "a"})
+    assert cache.lookup("chat", TENANT, "ns-b", "Write a caption for our sale") is None
+
+
+def test_invalidate_by_id(cache):
+    entry = cache.store("chat", TENANT, "ns", "Write a caption for our sale", {"content": "a"})
+    assert cache.invalidate(entry_ids=[entry.id]) == 1
+    assert cache.lookup("chat", TENANT, "ns", "Write a caption for our sale") is None
+
+
+def test_invalidate_counts_duplicate_ids_once(cache):
+    entry = cache.store("chat", TENANT, "ns", "Write a caption for our sale", {"content": "a"})
+    assert cache.invalidate(entry_ids=[entry.id, entry.id, "missing"]) == 1
+
+
+def test_rejects_non_uuid_tenants(cache):
+    assert not cache.accepts_tenant("tenant-from-the-body")
+    with pytest.raises(ValueError):
+        cache.store("chat", "tenant-from-the-body", "ns", "Write a caption", {"content": "a"})
+    assert cache.lookup("chat", "tenant-from-the-body", "ns", "Write a caption") is None
+    assert cache.stats()["tenants"] == 0
+
+
+def test_least_recently_used_tenant_is_evicted(cache):
+    tenants = [str(uuid.uuid4()) for _ in range(3)]
+    prompt = "Write a caption for our sale"
+    first = cache.store("chat", tenants[0], "ns", prompt, {"content": "0"})
+    cache.store("chat", tenants[1], "ns", prompt, {"content": "1"})
+    assert cache.lookup("chat", tenants[0], "ns", prompt) is not None
+    cache.store("chat", tenants[2], "ns", prompt, {"content": "2"})
+
+    assert cache.stats()["tenants"] == 2
+    assert cache.lookup("chat", tenants[1], "ns", prompt) is None
+    assert cache.lookup("chat", tenants[0], "ns", prompt).id == first.id
+    assert cache.stats()["entries"] == 2
+
+
+def test_disabled_cache_has_no_routes():
+    cache = SemanticCache(
+        routes=["chat"],
+        threshold=0.95,
+        ttl_seconds=60,
+        max_entries=16,
+        max_tenants=2,
+        dimensions=64,
+        disabled_reason="several workers",
+    )
+    assert not cache.enabled_for("chat")
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.streaming import OutputLength, coalesce
+
+
+async def _source(*items, blocked: asyncio.Event | None = None, cancelled: list | None = None):
+    """Yield strings; a number sleeps that long instead. Blocks at the end if asked."""
+    for item in items:
+        if isinstance(item, str):
+            yield item
+        else:
+            await asyncio.sleep(item)
+    if blocked is not None:
+        try:
+            await blocked.wait()
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+
+async def test_first_delta_passes_straight_through():
+    frames = coalesce(_source("a", "b", 10), interval=5, max_chars=1000)
+    assert await asyncio.wait_for(anext(frames), 0.5) == ["a"]
+    await frames.aclose()
+
+
+async def test_flushes_at_interval():
+    frames = coalesce(_source("a", "b", "c", 10, "d"), interval=0.05, max_chars=1000)
+    assert await anext(frames) == ["a"]
+    assert await asyncio.wait_for(anext(frames), 1) == ["b", "c"]
+    await frames.aclose()
+
+
+async def test_flushes_at_max_chars():
+    frames = coalesce(_source("a", "bb", "cc", "d"), interval=10, max_chars=4)
+    batches = [batch async for batch in frames]
+    assert batches == [["a"], ["bb", "cc"], ["d"]]
+
+
+async def test_closing_cancels_pending_read():
+    cancelled: list = []
+    frames = coalesce(
+        _source("a", "b", blocked=asyncio.Event(), cancelled=cancelled),
+        interval=0.01,
+        max_chars=1000,
+    )
+    assert await anext(frames) == ["a"]
+    # Flushed on the interval while the next read is still outstanding.
+    assert await anext(frames) == ["b"]
+    await frames.aclose()
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+
+
+async def test_disabled_coalescing_yields_every_delta():
+    frames = coalesce(_source("a", "b"), interval=0, max_chars=1000)
+    assert [batch async for batch in frames] == [["a"], ["b"]]
+
+
+@pytest.mark.parametrize(
+    "completed, streamed, max_tokens, expected",
+    [([], 50, 1000, 0), ([400], 100, 1000, 300), ([400], 100, 250, 150), ([400], 500, 1000, 0)],
+)
+def test_output_length_remaining(completed, streamed, max_tokens, expected):
+    estimate = OutputLength()
+    for tokens in completed:
+        estimate.observe(tokens)
+    assert estimate.remaining(streamed, max_tokens) == expected
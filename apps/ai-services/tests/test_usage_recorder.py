@@ -0,0 +1,175 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.usage import recorder as recorder_module
+from app.usage.recorder import UsageRecord, UsageRecorder
+
+BAD_TENANT = "00000000-0000-4000-8000-00000000dead"
+
+
+class FakeSupabase:
+    """Stands in for ``SupabaseClient``; every instance shares the class state."""
+
+    rows: list[dict] = []
+    calls = 0
+    # Raised by the next insert_many calls, in order (``None`` lets a call through)
+    failures: list[Exception | None] = []
+    delay = 0.0
+
+    def __init__(self) -> None:
+        pass
+
+    async def insert_many(self, table: str, rows: list[dict]) -> None:
+        type(self).calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        failure = self.failures.pop(0) if self.failures else None
+        if failure is not None:
+            raise failure
+        if any(row["tenant_id"] == BAD_TENANT for row in rows):
+            raise _status_error(409)
+        type(self).rows.extend(rows)
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://supabase.test/rest/v1/ai_usage_events")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+@pytest.fixture(autouse=True)
+def fake_supabase(monkeypatch):
+    FakeSupabase.rows = []
+    FakeSupabase.calls = 0
+    FakeSupabase.failures = []
+    FakeSupabase.delay = 0.0
+    monkeypatch.setattr(recorder_module, "SupabaseClient", FakeSupabase)
+    return FakeSupabase
+
+
+def _recorder(**overrides) -> UsageRecorder:
+    options = dict(
+        table="ai_usage_events",
+        enabled=True,
+        batch_size=10,
+        flush_interval=60.0,
+        max_buffer=100,
+    )
+    options.update(overrides)
+    return UsageRecorder(**options)
+
+
+def _record(tenant_id: str | None = None) -> UsageRecord:
+    return UsageRecord(route="chat", tenant_id=tenant_id, input_tokens=1)
+
+
+async def test_transient_failure_is_retried(fake_supabase):
+    recorder = _recorder()
+    for _ in range(3):
+        recorder.record(_record())
+    fake_supabase.failures = [httpx.ConnectError("refused")]
+
+    assert await recorder.flush() == 0
+    assert recorder.pending == 3
+    assert recorder.failed_batches == 1
+
+    assert await recorder.flush() == 3
+    assert recorder.pending == 0
+    assert recorder.dropped == 0
+    assert len(fake_supabase.rows) == 3
+
+
+async def test_server_error_is_retried(fake_supabase):
+    recorder = _recorder()
+    recorder.record(_record())
+    fake_supabase.failures = [_status_error(503)]
+
+    assert await recorder.flush() == 0
+    assert recorder.pending == 1
+    assert await recorder.flush() == 1
+
+
+async def test_rejected_rows_are_isolated_and_dropped(fake_supabase):
+    recorder = _recorder(batch_size=6)
+    for i in range(6):
+        recorder.record(_record(BAD_TENANT if i == 4 else None))
+
+    assert await recorder.flush() == 5
+    assert recorder.pending == 0
+    assert recorder.dropped == 1
+    assert recorder.rejected == 1
+    assert len(fake_supabase.rows) == 5
+
+    # Later batches are not blocked by the bad row.
+    recorder.record(_record())
+    assert await recorder.flush() == 1
+
+
+async def test_other_client_errors_drop_the_batch(fake_supabase):
+    recorder = _recorder()
+    for _ in range(4):
+        recorder.record(_record())
+    fake_supabase.failures = [_status_error(401)]
+
+    assert await recorder.flush() == 0
+    assert recorder.pending == 0
+    assert recorder.dropped == 4
+    assert fake_supabase.calls == 1
+
+
+async def test_retry_keeps_order_after_partial_bisect(fake_supabase):
+    recorder = _recorder(batch_size=4)
+    for i in range(4):
+        recorder.record(UsageRecord(route=f"r{i}", tenant_id=BAD_TENANT if i == 0 else None))
+    # Calls: [r0-r3] 409, [r0 r1] 409, [r0] 409, [r1] ok, [r2 r3] transient.
+    fake_supabase.failures = [None, None, None, None, httpx.ReadTimeout("slow")]
+
+    assert await recorder.flush() == 1
+    assert recorder.pending == 2
+    assert recorder.dropped == 1
+
+    assert await recorder.flush() == 2
+    assert [row["route"] for row in fake_supabase.rows] == ["r1", "r2", "r3"]
+
+
+async def test_stop_waits_for_in_flight_flush(fake_supabase):
+    recorder = _recorder(batch_size=3)
+    await recorder.start()
+    fake_supabase.delay = 0.05
+    for _ in range(3):
+        recorder.record(_record())
+    # Let the background flush pick the batch up before stopping.
+    await asyncio.sleep(0.01)
+    assert recorder.pending == 0
+
+    await recorder.stop()
+    assert len(fake_supabase.rows) == 3
+    assert recorder.dropped == 0
+
+
+async def test_stop_drains_remaining_records(fake_supabase):
+    recorder = _recorder()
+    await recorder.start()
+    for _ in range(3):
+        recorder.record(_record())
+
+    await recorder.stop()
+    assert len(fake_supabase.rows) == 3
+    assert recorder.pending == 0
+
+
+async def test_stop_timeout_counts_unwritten_records(fake_supabase):
+    recorder = _recorder(batch_size=3)
+    await recorder.start()
+    fake_supabase.delay = 1.0
+    for _ in range(3):
+        recorder.record(_record())
+    await asyncio.sleep(0.01)
+
+    await recorder.stop(timeout=0.05)
+    assert fake_supabase.rows == []
+    assert recorder.dropped == 3
+    assert recorder.pending == 0
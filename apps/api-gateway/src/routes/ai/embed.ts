@@ -27,7 +27,7 @@ export async function embedRoutes(fastify: FastifyInstance) {
     const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/embed`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify(request.body),
+      body: JSON.stringify({ ...request.body, tenant_id: request.tenantId }),
     });
 
     if (!aiResp.ok) {
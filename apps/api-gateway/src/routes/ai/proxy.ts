@@ -32,6 +32,11 @@ interface InsightsBody {
   additional_context?: string;
 }
 
+interface BulkInsightsBody {
+  categories?: string[];
+  additional_context?: string;
+}
+
 export async function proxyRoutes(fastify: FastifyInstance) {
 
   // ----------------------------------------------------------------
@@ -46,6 +51,7 @@ export async function proxyRoutes(fastify: FastifyInstance) {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
+          tenant_id: request.tenantId,
           messages: passthroughMessages,
           module_context,
           entity_context,
@@ -116,7 +122,7 @@ export async function proxyRoutes(fastify: FastifyInstance) {
     const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/chat/completions`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ messages, module_context, entity_context, max_tokens }),
+      body: JSON.stringify({ tenant_id: request.tenantId, messages, module_context, entity_context, max_tokens }),
     });
 
     if (!aiResp.ok) {
@@ -175,17 +181,24 @@ export async function proxyRoutes(fastify: FastifyInstance) {
   fastify.post<{ Body: ChatBody }>('/chat/stream', async (request, reply) => {
     const { messages: passthroughMessages, module_context, entity_context, max_tokens } = request.body;
 
+    // Abort the upstream stream as soon as the client goes away so the
+    // model stops generating tokens nobody will read.
+    const upstream = new AbortController();
+    reply.raw.on('close', () => upstream.abort());
+
     // --- Passthrough mode: caller already built the messages array ---
     if (Array.isArray(passthroughMessages) && passthroughMessages.length > 0) {
       const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/chat/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
+          tenant_id: request.tenantId,
           messages: passthroughMessages,
           module_context,
           entity_context,
           max_tokens,
         }),
+        signal: upstream.signal,
       });
 
       if (!aiResp.ok || !aiResp.body) {
@@ -202,6 +215,7 @@ export async function proxyRoutes(fastify: FastifyInstance) {
         'Content-Type': 'text/event-stream',
         'Cache-Control': 'no-cache',
         Connection: 'keep-alive',
+        'X-Accel-Buffering': 'no',
       });
 
       const reader = aiResp.body.getReader();
@@ -214,6 +228,8 @@ export async function proxyRoutes(fastify: FastifyInstance) {
           if (done) { reading = false; break; }
           reply.raw.write(decoder.decode(value, { stream: true }));
         }
+      } catch (err) {
+        if (!upstream.signal.aborted) throw err;
       } finally {
         reply.raw.end();
       }
@@ -265,7 +281,8 @@ export async function proxyRoutes(fastify: FastifyInstance) {
     const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/chat/stream`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ messages, module_context, entity_context, max_tokens }),
+      body: JSON.stringify({ tenant_id: request.tenantId, messages, module_context, entity_context, max_tokens }),
+      signal: upstream.signal,
     });
 
     if (!aiResp.ok || !aiResp.body) {
@@ -283,11 +300,14 @@ export async function proxyRoutes(fastify: FastifyInstance) {
       'Cache-Control': 'no-cache',
       Connection: 'keep-alive',
       'X-Conversation-Id': convId,
+      'X-Accel-Buffering': 'no',
     });
 
     let fullContent = '';
     let model = '';
     let tokensUsed: number | null = null;
+    let currentEvent = '';
+    let textLines = 0;
 
     const reader = aiResp.body.getReader();
     const decoder = new TextDecoder();
@@ -301,21 +321,23 @@ export async function proxyRoutes(fastify: FastifyInstance) {
         const chunk = decoder.decode(value, { stream: true });
         reply.raw.write(chunk);
 
-        // Parse SSE events to accumulate content
+        // Parse SSE events to accumulate content. Text frames hold several
+        // coalesced deltas and may span multiple data lines (joined by "\n").
         const lines = chunk.split('\n');
-        for (const line of lines) {
-          if (line.startsWith('event: text')) {
-            // Next data line is text content
-            const dataLine = lines[lines.indexOf(line) + 1];
-            if (dataLine?.startsWith('data:')) {
-              fullContent += dataLine.slice(5).trim();
-            }
-          }
-          if (line.startsWith('event: done')) {
-            const dataLine = lines[lines.indexOf(line) + 1];
-            if (dataLine?.startsWith('data:')) {
+        for (const rawLine of lines) {
+          const line = rawLine.replace(/\r$/, '');
+          if (line === '') {
+            currentEvent = '';
+            textLines = 0;
+          } else if (line.startsWith('event:')) {
+            currentEvent = line.slice(6).trim();
+          } else if (line.startsWith('data:')) {
+            const data = line.slice(5).replace(/^ /, '');
+            if (currentEvent === 'text') {
+              fullContent += (textLines++ > 0 ? '\n' : '') + data;
+            } else if (currentEvent === 'done') {
               try {
-                const meta = JSON.parse(dataLine.slice(5).trim());
+                const meta = JSON.parse(data);
                 model = meta.model ?? '';
                 tokensUsed = meta.tokens_used ?? null;
               } catch { /* ignore parse errors */ }
@@ -323,6 +345,9 @@ export async function proxyRoutes(fastify: FastifyInstance) {
           }
         }
       }
+    } catch (err) {
+      // Client disconnected: keep the partial answer saved below.
+      if (!upstream.signal.aborted) throw err;
     } finally {
       // Save assistant message after stream ends
       if (fullContent) {
@@ -376,7 +401,7 @@ export async function proxyRoutes(fastify: FastifyInstance) {
     const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/generate/`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ type, prompt, context, max_tokens }),
+      body: JSON.stringify({ tenant_id: request.tenantId, type, prompt, context, max_tokens }),
     });
 
     if (!aiResp.ok) {
@@ -422,7 +447,7 @@ export async function proxyRoutes(fastify: FastifyInstance) {
     const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/analyze/`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify(request.body),
+      body: JSON.stringify({ ...request.body, tenant_id: request.tenantId }),
     });
 
     if (!aiResp.ok) {
@@ -485,6 +510,94 @@ export async function proxyRoutes(fastify: FastifyInstance) {
     return { success: true, data: aiData };
   });
 
+  // ----------------------------------------------------------------
+  // Bulk insights (SSE) — one event per category as it completes,
+  // each persisted as soon as it arrives
+  // ----------------------------------------------------------------
+  fastify.post<{ Body: BulkInsightsBody }>('/insights/bulk', async (request, reply) => {
+    const { categories, additional_context } = request.body ?? {};
+
+    const upstream = new AbortController();
+    reply.raw.on('close', () => upstream.abort());
+
+    const aiResp = await fetch(`${AI_SERVICES_URL}/api/ai/insights/generate/bulk`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        tenant_id: request.tenantId,
+        categories,
+        additional_context,
+      }),
+      signal: upstream.signal,
+    });
+
+    if (!aiResp.ok || !aiResp.body) {
+      const errText = await aiResp.text();
+      reply.status(aiResp.status).send({
+        success: false,
+        error: { code: 'AI_SERVICE_ERROR', message: errText },
+      });
+      return;
+    }
+
+    reply.raw.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive',
+      'X-Accel-Buffering': 'no',
+    });
+
+    const reader = aiResp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    try {
+      let reading = true;
+      while (reading) {
+        const { done, value } = await reader.read();
+        if (done) { reading = false; break; }
+
+        const chunk = decoder.decode(value, { stream: true });
+        reply.raw.write(chunk);
+
+        // Persist each complete `insights` event
+        buffer += chunk;
+        const events = buffer.split(/\r?\n\r?\n/);
+        buffer = events.pop() ?? '';
+        for (const event of events) {
+          const lines = event.split(/\r?\n/);
+          if (!lines.some((line) => line.startsWith('event: insights'))) continue;
+          const data = lines
+            .filter((line) => line.startsWith('data:'))
+            .map((line) => line.slice(5).replace(/^ /, ''))
+            .join('\n');
+          try {
+            const result = JSON.parse(data) as {
+              category: string;
+              insights: Array<{ title: string; summary: string; type: string; details: Record<string, unknown> }>;
+            };
+            if (result.insights?.length) {
+              await fastify.supabase.from('ai_insights').insert(
+                result.insights.map((insight) => ({
+                  tenant_id: request.tenantId,
+                  category: result.category,
+                  type: insight.type,
+                  title: insight.title,
+                  summary: insight.summary,
+                  details: insight.details,
+                })),
+              );
+            }
+          } catch { /* ignore parse errors */ }
+        }
+      }
+    } catch (err) {
+      if (!upstream.signal.aborted) throw err;
+    } finally {
+      reply.raw.end();
+    }
+  });
+
   // ----------------------------------------------------------------
   // List insights
   // ----------------------------------------------------------------
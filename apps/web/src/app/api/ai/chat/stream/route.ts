@@ -206,7 +206,14 @@ export async function POST(request: NextRequest) {
   // Capture supabase client reference for use in the stream
   const db = supabase;
 
+  // Aborted when the browser disconnects so the gateway (and the model
+  // stream behind it) stop instead of generating tokens nobody reads.
+  const upstream = new AbortController();
+
   const stream = new ReadableStream({
+    cancel() {
+      upstream.abort();
+    },
     async start(controller) {
       let accumulatedContent = '';
       let model = 'unknown';
@@ -224,6 +231,7 @@ export async function POST(request: NextRequest) {
             ...(session?.access_token ? { Authorization: `Bearer ${session.access_token}` } : {}),
           },
           body: JSON.stringify(gatewayBody),
+          signal: upstream.signal,
         });
 
         if (!gatewayRes.ok || !gatewayRes.body) {
@@ -350,9 +358,9 @@ export async function POST(request: NextRequest) {
           conversation_id: savedConversationId,
         }));
       } catch {
-        sendSSE('error', 'AI service unavailable');
+        if (!upstream.signal.aborted) sendSSE('error', 'AI service unavailable');
       } finally {
-        controller.close();
+        if (!upstream.signal.aborted) controller.close();
       }
     },
   });
@@ -362,6 +370,7 @@ export async function POST(request: NextRequest) {
       'Content-Type': 'text/event-stream',
       'Cache-Control': 'no-cache, no-transform',
       Connection: 'keep-alive',
+      'X-Accel-Buffering': 'no',
     },
   });
 }
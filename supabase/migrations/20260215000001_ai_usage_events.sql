@@ -0,0 +1,30 @@
+-- ============================================================
+-- AI Usage Events: per-request token and latency accounting
+-- Written in batches by ai-services (service role) for billing
+-- and capacity planning.
+-- ============================================================
+
+create table public.ai_usage_events (
+  id bigint generated always as identity primary key,
+  tenant_id uuid references public.tenants(id) on delete cascade,
+  route text not null,
+  model text,
+  input_tokens integer not null default 0,
+  output_tokens integer not null default 0,
+  cache_creation_input_tokens integer not null default 0,
+  cache_read_input_tokens integer not null default 0,
+  upstream_latency_ms real,
+  ttft_ms real,
+  cached boolean not null default false,
+  status text not null default 'ok' check (status in ('ok', 'error')),
+  created_at timestamptz not null default now()
+);
+
+create index idx_ai_usage_events_tenant_created on public.ai_usage_events (tenant_id, created_at desc);
+create index idx_ai_usage_events_created on public.ai_usage_events (created_at);
+alter table public.ai_usage_events enable row level security;
+
+-- Tenant members can read their own usage; only the service role writes.
+create policy "Tenant isolation for ai_usage_events"
+  on public.ai_usage_events for select
+  using (tenant_id = public.get_current_tenant_id());
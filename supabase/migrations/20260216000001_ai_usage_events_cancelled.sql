@@ -0,0 +1,11 @@
+-- ============================================================
+-- AI Usage Events: record chat streams the client abandoned
+-- (cancelled upstream on disconnect) with their own status.
+-- ============================================================
+
+alter table public.ai_usage_events
+  drop constraint ai_usage_events_status_check;
+
+alter table public.ai_usage_events
+  add constraint ai_usage_events_status_check
+  check (status in ('ok', 'error', 'cancelled'));